@@ -1,16 +1,12 @@
 #!/usr/bin/env python3
 """Benchmark script to compare original vs optimized performance."""
 
-import os
-import sys
 import time
 from datetime import datetime, timezone
 from typing import Any, Dict
 
 import psutil
 
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
 from ccusage_monitor import calculations, calculations_optimized, data, data_optimized
 from ccusage_monitor.cache import cache
 
@@ -128,7 +128,7 @@ def main_with_args(args: CLIArgs):
                 # Time calculations
                 start_time_str = active_block.get("startTime")
                 if start_time_str:
-                    start_time = datetime.fromisoformat(start_time_str.replace("Z", "+00:00"))
+                    start_time = calculations.parse_iso_time(start_time_str)
                     current_time = datetime.now(start_time.tzinfo)
                 else:
                     current_time = datetime.now(timezone.utc)
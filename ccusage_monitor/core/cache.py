@@ -1,7 +1,9 @@
 """Cache module for performance optimization."""
 
+import contextlib
 import time
-from typing import Any, Dict, Generic, Optional, Tuple, TypeVar, Union
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Optional, Tuple, TypeVar, Union
 
 import pytz
 
@@ -9,15 +11,29 @@ from ccusage_monitor.protocols import CcusageData, DisplayValues
 
 T = TypeVar("T")
 
+# Default number of entries kept before the least recently used one is evicted
+DEFAULT_MAXSIZE = 256
+
 # The cache can store a variety of types. This Union defines them.
 CacheValue = Union[bool, CcusageData, float, str, pytz.BaseTzInfo, Dict[str, Any], DisplayValues]
 
 
 class Cache(Generic[T]):
-    """Simple in-memory cache with TTL support."""
+    """Simple in-memory LRU cache with TTL support, bounded to maxsize entries."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        self.maxsize = maxsize
+        self._cache: OrderedDict[str, Tuple[T, float]] = OrderedDict()
 
-    def __init__(self) -> None:
-        self._cache: Dict[str, Tuple[T, float]] = {}
+    def __len__(self) -> int:
+        """Return the number of entries, including expired ones not yet evicted."""
+        return len(self._cache)
+
+    def _touch(self, key: str) -> None:
+        """Mark key as most recently used."""
+        # The entry may have been evicted or replaced concurrently
+        with contextlib.suppress(KeyError):
+            self._cache.move_to_end(key)
 
     def get(self, key: str, ttl: float = 0) -> Optional[T]:
         """Get value from cache if not expired.
@@ -29,21 +45,55 @@ class Cache(Generic[T]):
         Returns:
             Cached value or None if expired/not found
         """
-        if key not in self._cache:
+        entry = self._cache.get(key)
+        if entry is None:
             return None
 
-        value, timestamp = self._cache[key]
+        value, timestamp = entry
 
         if ttl > 0 and time.time() - timestamp > ttl:
-            # Expired
-            del self._cache[key]
+            # Expired (pop tolerates a concurrent refresh replacing the entry)
+            self._cache.pop(key, None)
             return None
 
+        self._touch(key)
+        return value
+
+    def get_or_set(self, key: str, loader: Callable[[], T], ttl: float = 0) -> T:
+        """Get value from cache, calling loader to populate it on a miss.
+
+        Unlike get(), falsy values (None, False, 0) count as cache hits.
+
+        Args:
+            key: Cache key
+            loader: Zero-argument callable producing the value on a miss
+            ttl: Time to live in seconds (0 = no expiration)
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        # Entries are (value, timestamp) tuples, so None only ever means "no entry"
+        entry = self._cache.get(key)
+        if entry is not None:
+            value, timestamp = entry
+            if ttl <= 0 or time.time() - timestamp <= ttl:
+                self._touch(key)
+                return value
+
+        value = loader()
+        self.set(key, value)
         return value
 
     def set(self, key: str, value: T) -> None:
-        """Store value in cache with current timestamp."""
+        """Store value in cache with current timestamp, evicting the LRU entry when full."""
         self._cache[key] = (value, time.time())
+        self._touch(key)
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Remove a cache entry if present."""
+        self._cache.pop(key, None)
 
     def clear(self) -> None:
         """Clear all cache entries."""
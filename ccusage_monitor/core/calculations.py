@@ -1,6 +1,8 @@
 """Consolidated calculations module with optimized algorithms."""
 
-from datetime import datetime, timedelta, timezone
+import bisect
+import functools
+from datetime import date, datetime, timedelta, timezone, tzinfo
 from typing import List, Optional, cast
 
 import pytz
@@ -10,6 +12,12 @@ from ccusage_monitor.core.config import TOKEN_LIMITS
 from ccusage_monitor.protocols import CcusageBlock
 
 
+@functools.lru_cache(maxsize=4096)
+def parse_iso_time(timestamp: str) -> datetime:
+    """Parse a ccusage ISO timestamp, memoized since block times repeat every refresh."""
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+
+
 def calculate_hourly_burn_rate(blocks: List[CcusageBlock], current_time: datetime) -> float:
     """Optimized burn rate calculation with early termination and caching."""
     if not blocks:
@@ -21,7 +29,9 @@ def calculate_hourly_burn_rate(blocks: List[CcusageBlock], current_time: datetim
     if cached is not None:
         return cast(float, cached)
 
-    one_hour_ago = current_time - timedelta(hours=1)
+    # Work in epoch seconds: float arithmetic instead of datetime/timedelta objects per block
+    now = current_time.timestamp()
+    one_hour_ago = now - 3600
     total_tokens = 0.0
 
     # Process blocks in reverse order (most recent first) for early termination
@@ -35,21 +45,19 @@ def calculate_hourly_burn_rate(blocks: List[CcusageBlock], current_time: datetim
             continue
 
         # Parse start time once
-        start_time = datetime.fromisoformat(start_time_str.replace("Z", "+00:00"))
+        start_time = parse_iso_time(start_time_str).timestamp()
 
         # Early termination - if block started after current time, skip
-        if start_time > current_time:
+        if start_time > now:
             continue
 
         # Determine session end time
-        if block.get("isActive"):
-            session_actual_end = current_time
+        is_active = block.get("isActive")
+        if is_active:
+            session_actual_end = now
         else:
             actual_end_str = block.get("actualEndTime")
-            if actual_end_str:
-                session_actual_end = datetime.fromisoformat(actual_end_str.replace("Z", "+00:00"))
-            else:
-                session_actual_end = current_time
+            session_actual_end = parse_iso_time(actual_end_str).timestamp() if actual_end_str else now
 
         # Early termination - if session ended before the last hour
         if session_actual_end < one_hour_ago:
@@ -57,7 +65,7 @@ def calculate_hourly_burn_rate(blocks: List[CcusageBlock], current_time: datetim
 
         # Calculate overlap with the last hour window
         session_start_in_hour = max(start_time, one_hour_ago)
-        session_end_in_hour = min(session_actual_end, current_time)
+        session_end_in_hour = min(session_actual_end, now)
 
         if session_end_in_hour <= session_start_in_hour:
             continue
@@ -65,17 +73,16 @@ def calculate_hourly_burn_rate(blocks: List[CcusageBlock], current_time: datetim
         # Calculate the actual tokens consumed within the last hour
         session_tokens = block.get("totalTokens", 0)
 
-        if block.get("isActive"):
+        if is_active:
             # For active blocks, all tokens contribute to the burn rate
-            total_session_duration_minutes = (session_actual_end - start_time).total_seconds() / 60
+            total_session_duration_minutes = (session_actual_end - start_time) / 60
             if total_session_duration_minutes > 0:
-                tokens_per_minute = session_tokens / total_session_duration_minutes
-                total_tokens += tokens_per_minute
+                total_tokens += session_tokens / total_session_duration_minutes
         else:
             # For completed blocks, proportion tokens based on overlap with last hour
-            total_session_duration = (session_actual_end - start_time).total_seconds()
+            total_session_duration = session_actual_end - start_time
             if total_session_duration > 0:
-                hour_duration = (session_end_in_hour - session_start_in_hour).total_seconds()
+                hour_duration = session_end_in_hour - session_start_in_hour
                 proportional_tokens = session_tokens * (hour_duration / total_session_duration)
                 duration_minutes = hour_duration / 60
                 if duration_minutes > 0:
@@ -87,32 +94,28 @@ def calculate_hourly_burn_rate(blocks: List[CcusageBlock], current_time: datetim
     return result
 
 
+@functools.lru_cache(maxsize=32)
+def _get_timezone(timezone_str: str) -> pytz.BaseTzInfo:
+    """Resolve a timezone name once, falling back to Europe/Warsaw for unknown names."""
+    try:
+        return pytz.timezone(timezone_str)
+    except pytz.exceptions.UnknownTimeZoneError:
+        return pytz.timezone("Europe/Warsaw")
+
+
 def get_next_reset_time(
     current_time: datetime,
     custom_reset_hour: Optional[int] = None,
     timezone_str: str = "Europe/Warsaw",
 ) -> datetime:
-    """Optimized reset time calculation with caching."""
-    # Create cache key based on hour and timezone
-    cache_key = f"reset_time_{current_time.hour}_{timezone_str}_{custom_reset_hour}"
-    cached = cache.get(cache_key, ttl=300)  # Cache for 5 minutes
-    if cached is not None:
-        return datetime.fromisoformat(cast(str, cached))
-
+    """Optimized reset time calculation, memoized per hour of the target timezone."""
     # If current_time is in UTC and no specific timezone is needed for tests, stay in UTC
+    target_tz: tzinfo
     if current_time.tzinfo == timezone.utc and timezone_str == "Europe/Warsaw":
         target_time = current_time
-        target_tz = current_time.tzinfo
+        target_tz = timezone.utc
     else:
-        # Cache timezone object
-        tz_cache_key = f"timezone_{timezone_str}"
-        target_tz = cast(Optional[pytz.BaseTzInfo], cache.get(tz_cache_key))
-        if target_tz is None:
-            try:
-                target_tz = pytz.timezone(timezone_str)
-            except pytz.exceptions.UnknownTimeZoneError:
-                target_tz = pytz.timezone("Europe/Warsaw")
-            cache.set(tz_cache_key, target_tz)
+        target_tz = _get_timezone(timezone_str)
 
         # Convert to target timezone
         if current_time.tzinfo is not None:
@@ -120,25 +123,43 @@ def get_next_reset_time(
         else:
             target_time = target_tz.localize(current_time)
 
+    # The result only changes with the hour (and on the hour itself), not every refresh
+    return _next_reset(
+        target_time.date(),
+        target_time.hour,
+        target_time.minute == 0,
+        target_tz,
+        custom_reset_hour,
+        current_time.tzinfo,
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _next_reset(
+    target_date: date,
+    current_hour: int,
+    on_the_hour: bool,
+    target_tz: tzinfo,
+    custom_reset_hour: Optional[int],
+    output_tz: Optional[tzinfo],
+) -> datetime:
+    """Compute the next reset after current_hour on target_date in target_tz."""
     # Determine reset hours
     reset_hours = [custom_reset_hour] if custom_reset_hour is not None else [4, 9, 14, 18, 23]
 
-    current_hour = target_time.hour
-    current_minute = target_time.minute
-
     # Find next reset hour
     next_reset_hour = None
     for hour in reset_hours:
-        if current_hour < hour or (current_hour == hour and current_minute == 0):
+        if current_hour < hour or (current_hour == hour and on_the_hour):
             next_reset_hour = hour
             break
 
     # Determine date
     if next_reset_hour is None:
         next_reset_hour = reset_hours[0]
-        next_reset_date = target_time.date() + timedelta(days=1)
+        next_reset_date = target_date + timedelta(days=1)
     else:
-        next_reset_date = target_time.date()
+        next_reset_date = target_date
 
     # Create reset datetime
     if target_tz == timezone.utc:
@@ -148,16 +169,15 @@ def get_next_reset_time(
         )
     else:
         # For other timezones, use pytz localize
-        next_reset = target_tz.localize(
+        next_reset = cast(pytz.BaseTzInfo, target_tz).localize(
             datetime.combine(next_reset_date, datetime.min.time().replace(hour=next_reset_hour)),
             is_dst=None,
         )
 
     # Convert back if needed
-    if current_time.tzinfo is not None and current_time.tzinfo != target_tz and target_tz != timezone.utc:
-        next_reset = next_reset.astimezone(current_time.tzinfo)
+    if output_tz is not None and output_tz != target_tz and target_tz != timezone.utc:
+        next_reset = next_reset.astimezone(output_tz)
 
-    cache.set(cache_key, next_reset.isoformat())
     return next_reset
 
 
@@ -195,10 +215,11 @@ VELOCITY_INDICATORS = [
     (float("inf"), "⚡"),  # Very fast
 ]
 
+# Finite upper bounds and their emoji, for a bisect instead of a compare chain
+_VELOCITY_THRESHOLDS = tuple(threshold for threshold, _ in VELOCITY_INDICATORS[:-1])
+_VELOCITY_EMOJI = tuple(indicator for _, indicator in VELOCITY_INDICATORS)
+
 
 def get_velocity_indicator(burn_rate: float) -> str:
-    """Get velocity emoji with O(1) lookup."""
-    for threshold, indicator in VELOCITY_INDICATORS:
-        if burn_rate < threshold:
-            return indicator
-    return "⚡"  # Fallback
+    """Get velocity emoji with a binary search over the thresholds."""
+    return _VELOCITY_EMOJI[bisect.bisect_right(_VELOCITY_THRESHOLDS, burn_rate)]
@@ -1,12 +1,14 @@
 """Configuration and CLI argument parsing for ccusage monitor."""
 
 import argparse
+import functools
 
 from ccusage_monitor.protocols import CLIArgs
 
 
-def parse_args() -> CLIArgs:
-    """Parse command line arguments."""
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser once; it does not depend on the arguments."""
     parser = argparse.ArgumentParser(description="Claude Token Monitor - Real-time token usage monitoring")
     parser.add_argument(
         "--plan",
@@ -38,18 +40,12 @@ def parse_args() -> CLIArgs:
         default=3,
         help="Refresh interval in seconds (default: 3, for rich mode)",
     )
-    args = parser.parse_args()
+    return parser
 
-    # Create a CLIArgs instance with the parsed values
-    cli_args = CLIArgs()
-    cli_args.plan = args.plan
-    cli_args.reset_hour = args.reset_hour
-    cli_args.timezone = args.timezone
-    cli_args.performance = args.performance
-    cli_args.rich = args.rich
-    cli_args.refresh = args.refresh
 
-    return cli_args
+def parse_args() -> CLIArgs:
+    """Parse command line arguments."""
+    return _build_parser().parse_args(namespace=CLIArgs())
 
 
 # Color constants
@@ -59,6 +55,7 @@ YELLOW = "\033[93m"
 WHITE = "\033[97m"
 GRAY = "\033[90m"
 GREEN = "\033[92m"
+BLUE = "\033[94m"
 RESET = "\033[0m"
 
 # Token limits
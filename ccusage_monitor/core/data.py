@@ -1,26 +1,59 @@
 """Consolidated data module with optimized ccusage interaction and caching."""
 
 import asyncio
+import functools
 import json
+import os
 import shutil
 import subprocess
-from typing import List, Optional, cast
+import threading
+import time
+import weakref
+from types import MappingProxyType
+from typing import Any, Callable, List, Mapping, Optional, Union, cast
 
+from ccusage_monitor.core import disk_cache
 from ccusage_monitor.core.cache import cache
+from ccusage_monitor.core.config import TOKEN_LIMITS
 from ccusage_monitor.protocols import CcusageBlock, CcusageData
 
+# orjson is an optional, faster parser; its JSONDecodeError subclasses the stdlib one
+try:
+    import orjson
 
+    _json_loads: Callable[[Union[str, bytes]], Any] = orjson.loads
+except ImportError:  # pragma: no cover - depends on the environment
+    _json_loads = json.loads
+
+
+def _freeze(value: Any) -> Any:
+    """Return a read-only copy of parsed JSON: objects become mapping proxies and arrays tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@functools.lru_cache(maxsize=8)
+def _parse(stdout: Union[str, bytes]) -> CcusageData:
+    """Parse ccusage JSON output, reusing the result for identical output.
+
+    The result is shared by every caller that sees the same output, so it is
+    deep-frozen rather than returned as mutable dicts and lists.
+    """
+    return cast(CcusageData, _freeze(_json_loads(stdout)))
+
+
+@functools.lru_cache(maxsize=None)
 def check_ccusage_installed() -> bool:
-    """Check if ccusage is installed (with caching)."""
-    # Cache the result for the entire session
-    cached = cache.get("ccusage_installed")
-    if isinstance(cached, bool):
-        return cached
+    """Check if ccusage is on PATH, printing install instructions when missing.
 
-    result = shutil.which("ccusage") is not None
-    cache.set("ccusage_installed", result)
+    Probed once per process; the monitor exits when ccusage is missing.
+    """
+    found = shutil.which("ccusage") is not None
 
-    if not result:
+    if not found:
         print("❌ 'ccusage' command not found!")
         print("\nThis tool requires 'ccusage' to be installed globally via npm.")
         print("\nTo install ccusage:")
@@ -28,29 +61,144 @@ def check_ccusage_installed() -> bool:
         print("2. Run: npm install -g ccusage")
         print("\nFor more information, visit: https://github.com/ryoppippi/ccusage")
 
-    return result
+    return found
+
+
+# Cache key and time of the most recently stored ccusage data
+_data_key: Optional[str] = None
+_data_stored_at = 0.0
+
+# Guards _data_key, which the UI thread and the refresher both replace
+_data_key_lock = threading.Lock()
+
+
+# How long the ccusage binary and the data cache key are reused before being resolved again
+_RESOLVE_TTL = 300
+
+
+def _ccusage_path() -> Optional[str]:
+    """Return the absolute path of the ccusage binary (cached for five minutes)."""
+    # A missing binary is cached as "" since None is not a cache value
+    path = cast(str, cache.get_or_set("ccusage_path", lambda: shutil.which("ccusage") or "", ttl=_RESOLVE_TTL))
+    return path or None
+
+
+def _ccusage_argv() -> List[str]:
+    """Build the ccusage command line.
+
+    An absolute executable path together with close_fds=False lets subprocess
+    launch ccusage via posix_spawn instead of forking the monitor process.
+    """
+    return [_ccusage_path() or "ccusage", "blocks", "--offline", "--json"]
+
+
+def _ccusage_data_key() -> str:
+    """Return the ccusage data cache key.
+
+    The key embeds the ccusage binary's mtime, so an upgraded ccusage
+    invalidates the data. Like the binary's path it is resolved at most every
+    five minutes, which keeps the stat call off the per-refresh cache hit.
+    """
+    return cast(str, cache.get_or_set("ccusage_data_key", _build_data_key, ttl=_RESOLVE_TTL))
+
+
+def _build_data_key() -> str:
+    """Build the ccusage data cache key from the binary's mtime."""
+    path = _ccusage_path()
+    try:
+        mtime = os.path.getmtime(path) if path else 0.0
+    except OSError:
+        mtime = 0.0
+    return f"ccusage_data:{mtime}"
+
+
+def _store_data(key: str, data: CcusageData) -> None:
+    """Cache ccusage data under key, purging the entry of a previous key."""
+    global _data_key, _data_stored_at
+    with _data_key_lock:
+        if _data_key is not None and _data_key != key:
+            cache.delete(_data_key)
+        cache.set(key, data)
+        _data_key = key
+        _data_stored_at = time.time()
+
+
+def _warm_start() -> Optional[CcusageData]:
+    """Seed the in-memory cache from disk before this process first runs ccusage."""
+    if _data_key is not None:
+        return None
+    key = _ccusage_data_key()
+    stdout = disk_cache.load(key)
+    if stdout is None:
+        return None
+    try:
+        data = _parse(stdout)
+    except ValueError:
+        # A truncated file just means a cold start
+        return None
+    _store_data(key, data)
+    return data
+
+
+# Seconds ccusage data is served from the in-memory cache
+_DATA_TTL = 5.0
+
+# Coalesce concurrent cache misses into a single ccusage subprocess
+_ccusage_lock = threading.Lock()
+_ccusage_async_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+
+def _cached_data() -> Optional[CcusageData]:
+    """Return ccusage data from the cache (5 second TTL), if present."""
+    return cast(Optional[CcusageData], cache.get(_ccusage_data_key(), ttl=_DATA_TTL))
+
+
+def _async_lock() -> asyncio.Lock:
+    """Return the stampede lock of the running event loop.
+
+    asyncio.Lock is bound to a loop, and the refresher thread runs its own.
+    """
+    loop = asyncio.get_running_loop()
+    lock = _ccusage_async_locks.get(loop)
+    if lock is None:
+        lock = _ccusage_async_locks[loop] = asyncio.Lock()
+    return lock
 
 
 def run_ccusage() -> Optional[CcusageData]:
     """Execute ccusage blocks --json command with result caching."""
-    # Check cache first (5 second TTL for ccusage data)
-    cached_data = cache.get("ccusage_data", ttl=5)
+    cached_data = _cached_data()
     if cached_data is not None:
-        return cast(Optional[CcusageData], cached_data)
+        return cached_data
 
+    with _ccusage_lock:
+        # Another caller may have filled the cache while we waited; on a cold start, try disk
+        cached_data = _cached_data()
+        if cached_data is None:
+            cached_data = _warm_start()
+        if cached_data is not None:
+            return cached_data
+        return _fetch_ccusage()
+
+
+def _fetch_ccusage() -> Optional[CcusageData]:
+    """Run ccusage synchronously without consulting the cache and store the result."""
+    key = _ccusage_data_key()
     try:
         # Use PIPE constants for better performance
         result = subprocess.run(
-            ["ccusage", "blocks", "--offline", "--json"],
+            _ccusage_argv(),
+            # Raw bytes go straight to orjson, skipping a UTF-8 decode into str
             capture_output=True,
-            text=True,
             check=True,
+            close_fds=False,
             # Limit execution time
             timeout=10,
         )
 
-        data = cast(CcusageData, json.loads(result.stdout))
-        cache.set("ccusage_data", data)
+        data = _parse(result.stdout)
+        _store_data(key, data)
+        disk_cache.save(key, result.stdout)
         return data
 
     except subprocess.TimeoutExpired:
@@ -61,9 +209,9 @@ def run_ccusage() -> Optional[CcusageData]:
         return None
     except subprocess.CalledProcessError as e:
         print(f"❌ Error running ccusage: {e}")
-        stderr_str = cast(Optional[str], e.stderr)
-        if stderr_str:
-            print(f"Error details: {stderr_str}")
+        stderr = cast(Optional[bytes], e.stderr)
+        if stderr:
+            print(f"Error details: {stderr.decode(errors='replace')}")
         print("\nPossible solutions:")
         print("1. Make sure you're logged into Claude in your browser")
         print("2. Try running 'ccusage login' if authentication is required")
@@ -75,19 +223,28 @@ def run_ccusage() -> Optional[CcusageData]:
 
 async def run_ccusage_async() -> Optional[CcusageData]:
     """Async version of run_ccusage for non-blocking execution."""
-    # Check cache first
-    cached_data = cache.get("ccusage_data", ttl=5)
+    cached_data = _cached_data()
     if cached_data is not None:
-        return cast(Optional[CcusageData], cached_data)
+        return cached_data
+
+    async with _async_lock():
+        cached_data = _cached_data()
+        if cached_data is None:
+            cached_data = _warm_start()
+        if cached_data is not None:
+            return cached_data
+        return await _fetch_ccusage_async()
 
+
+async def _fetch_ccusage_async() -> Optional[CcusageData]:
+    """Run ccusage without consulting the cache and store the result."""
+    key = _ccusage_data_key()
     try:
         proc = await asyncio.create_subprocess_exec(
-            "ccusage",
-            "blocks",
-            "--offline",
-            "--json",
+            *_ccusage_argv(),
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
+            close_fds=False,
         )
 
         stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=10)
@@ -97,8 +254,9 @@ async def run_ccusage_async() -> Optional[CcusageData]:
                 print(f"❌ Error running ccusage: {stderr.decode()}")
             return None
 
-        data = cast(CcusageData, json.loads(stdout.decode()))
-        cache.set("ccusage_data", data)
+        data = _parse(stdout)
+        _store_data(key, data)
+        disk_cache.save(key, stdout)
         return data
 
     except asyncio.TimeoutError:
@@ -109,29 +267,26 @@ async def run_ccusage_async() -> Optional[CcusageData]:
         return None
 
 
+# Read-only snapshot of the fixed-plan limits; lookups are a single dict probe
+_LIMITS: Mapping[str, int] = MappingProxyType(dict(TOKEN_LIMITS))
+
+
 def get_token_limit(plan: str, blocks: Optional[List[CcusageBlock]] = None) -> int:
-    """Get token limit based on plan type (with caching)."""
-    # For fixed plans, use cached values
+    """Get token limit based on plan type; custom_max is derived from the blocks."""
+    # Fixed plans are a pure function of the plan name (unknown plans fall back to pro)
     if plan != "custom_max":
-        cache_key = f"token_limit_{plan}"
-        cached = cache.get(cache_key)
-        if isinstance(cached, (int, float)):
-            return int(cached)
-
-        limits = {"pro": 7000, "max5": 35000, "max20": 140000}
-        limit = limits.get(plan, 7000)
-        cache.set(cache_key, limit)
-        return limit
+        return _LIMITS.get(plan, 7000)
 
     # For custom_max, calculate from blocks
     if not blocks:
         return 7000
 
-    # Use list comprehension for better performance
-    valid_tokens = [
-        block.get("totalTokens", 0)
-        for block in blocks
-        if not block.get("isGap", False) and not block.get("isActive", False)
-    ]
-
-    return max(valid_tokens) if valid_tokens else 7000
+    # Reduce over a generator so no intermediate list is materialized
+    return max(
+        (
+            block.get("totalTokens", 0)
+            for block in blocks
+            if not block.get("isGap", False) and not block.get("isActive", False)
+        ),
+        default=7000,
+    )
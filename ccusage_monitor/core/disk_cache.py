@@ -0,0 +1,60 @@
+"""On-disk copy of the last ccusage output, so a restarted monitor skips the cold spawn."""
+
+import contextlib
+import hashlib
+import os
+import threading
+import time
+from typing import Optional, Union
+
+
+def _cache_path() -> str:
+    """Return the cache file under $XDG_CACHE_HOME, falling back to ~/.cache."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "ccusage-monitor", "last.json")
+
+
+# The file holds the data key the output was fetched under, a newline, then ccusage's stdout
+_DISK_CACHE = _cache_path()
+_DISK_CACHE_TTL = 5.0
+
+# Digest of the key and output last written, so an unchanged payload only refreshes the mtime
+_saved_digest: Optional[bytes] = None
+
+
+def load(key: str) -> Optional[bytes]:
+    """Return ccusage stdout saved under key within the TTL, if any."""
+    try:
+        if time.time() - os.stat(_DISK_CACHE).st_mtime >= _DISK_CACHE_TTL:
+            return None
+        with open(_DISK_CACHE, "rb") as f:
+            saved_key, _, stdout = f.read().partition(b"\n")
+    except OSError:
+        # A missing or unreadable file just means a cold start
+        return None
+    # Output from another ccusage binary is not served as fresh
+    return stdout if saved_key == key.encode() else None
+
+
+def save(key: str, stdout: Union[str, bytes]) -> None:
+    """Record ccusage stdout under key, rewriting the file only when the payload changed."""
+    global _saved_digest
+    payload = key.encode() + b"\n" + (stdout.encode() if isinstance(stdout, str) else stdout)
+    digest = hashlib.blake2b(payload, digest_size=16).digest()
+    if digest == _saved_digest:
+        # Same payload: bumping the mtime keeps it within the TTL; rewrite only if the file is gone
+        with contextlib.suppress(OSError):
+            os.utime(_DISK_CACHE)
+            return
+
+    tmp = f"{_DISK_CACHE}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(_DISK_CACHE), exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, _DISK_CACHE)
+        _saved_digest = digest
+    except OSError:
+        # The cache is an optimization only; drop any partial temp file
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
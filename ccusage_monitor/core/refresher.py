@@ -0,0 +1,73 @@
+"""Background thread that keeps the ccusage data cache warm."""
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+from ccusage_monitor.core import data
+
+# Background refresher state
+_refresher: Optional[threading.Thread] = None
+_refresher_stop = threading.Event()
+
+# The refresher refetches this long before cached data expires, leaving time for ccusage to run
+_REFRESH_LEAD = 1.0
+# Shortest pause between refreshes, so a zero interval or a failing ccusage can't spin
+_MIN_REFRESH_INTERVAL = 1.0
+
+
+def _refresh_delay(interval: float) -> float:
+    """Return the seconds until the next refresh.
+
+    Data is refetched shortly before it expires, so ccusage runs at most
+    about once per TTL, and never more often than interval allows.
+    """
+    expiring = data._data_stored_at + data._DATA_TTL - _REFRESH_LEAD - time.time()
+    return max(interval, expiring, _MIN_REFRESH_INTERVAL)
+
+
+async def _refresh_loop(interval: float) -> None:
+    """Repopulate the ccusage cache before it expires until stopped."""
+    loop = asyncio.get_running_loop()
+    while not _refresher_stop.is_set():
+        requested = time.time()
+        # Share run_ccusage()'s lock, so a UI cache miss and a refresh never both spawn ccusage
+        lock = data._ccusage_lock
+        await loop.run_in_executor(None, lock.acquire)
+        try:
+            # Another caller may have stored fresh data while we waited
+            if data._data_stored_at < requested:
+                await data._fetch_ccusage_async()
+        finally:
+            lock.release()
+        await loop.run_in_executor(None, _refresher_stop.wait, _refresh_delay(interval))
+
+
+def start_refresher(interval: float = 0.0) -> threading.Thread:
+    """Keep the ccusage cache warm from a background thread.
+
+    Refreshes are scheduled just before the cached data expires, so
+    run_ccusage() is served from the cache instead of spawning ccusage on
+    the UI thread. A longer interval (such as a slow --refresh) spaces them
+    further apart.
+    """
+    global _refresher
+    if _refresher is not None and _refresher.is_alive():
+        return _refresher
+
+    _refresher_stop.clear()
+    _refresher = threading.Thread(
+        target=asyncio.run, args=(_refresh_loop(interval),), name="ccusage-refresher", daemon=True
+    )
+    _refresher.start()
+    return _refresher
+
+
+def stop_refresher(timeout: float = 1.0) -> None:
+    """Stop the background refresher if it is running."""
+    global _refresher
+    _refresher_stop.set()
+    if _refresher is not None:
+        _refresher.join(timeout)
+        _refresher = None
@@ -0,0 +1,34 @@
+"""Change detection over ccusage data between monitor refreshes."""
+
+import hashlib
+
+from ccusage_monitor.protocols import CcusageData
+
+
+def data_fingerprint(data: CcusageData) -> bytes:
+    """Return a 16-byte digest of the block fields the monitor renders from."""
+    digest = hashlib.blake2b(digest_size=16)
+    for block in data.get("blocks", ()):
+        digest.update(
+            f"{block.get('totalTokens', 0)}|{block.get('startTime', '')}|{block.get('actualEndTime', '')}|"
+            f"{int(bool(block.get('isActive')))}{int(bool(block.get('isGap')))}\n".encode()
+        )
+    return digest.digest()
+
+
+class MonitorState:
+    """Track whether ccusage data changed between refreshes.
+
+    Only the digest of the previous data is kept, so a check never compares
+    or holds on to the nested block dicts.
+    """
+
+    def __init__(self) -> None:
+        self._last_digest = b""
+
+    def data_changed(self, data: CcusageData) -> bool:
+        """Return True on the first call and whenever the blocks differ from the previous call."""
+        digest = data_fingerprint(data)
+        changed = digest != self._last_digest
+        self._last_digest = digest
+        return changed
@@ -1,10 +1,11 @@
 """Main module for Claude Code Usage Monitor."""
 
 import argparse
+import functools
 import sys
 import time
 from datetime import datetime, timedelta, timezone
-from typing import List
+from typing import List, Optional
 
 import pytz
 
@@ -15,8 +16,9 @@ from ccusage_monitor.ui import display
 OPTIMIZED = True
 
 
-def parse_args() -> CLIArgs:
-    """Parse command line arguments."""
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser once; it does not depend on the arguments."""
     parser = argparse.ArgumentParser(description="Claude Token Monitor - Real-time token usage monitoring")
     parser.add_argument(
         "--plan",
@@ -48,11 +50,21 @@ def parse_args() -> CLIArgs:
         default=3,
         help="Refresh interval in seconds (default: 3, for rich mode)",
     )
-    return parser.parse_args(namespace=CLIArgs())
+    return parser
+
+
+def parse_args() -> CLIArgs:
+    """Parse command line arguments."""
+    return _build_parser().parse_args(namespace=CLIArgs())
 
 
-def main() -> None:
-    """Main monitoring loop."""
+def main(max_iterations: Optional[int] = None) -> None:
+    """Main monitoring loop.
+
+    Args:
+        max_iterations: Stop after this many refreshes instead of running until
+            interrupted; None (the default) loops forever.
+    """
     args = parse_args()
 
     # Use Rich version if requested
@@ -91,17 +103,19 @@ def main() -> None:
     reset = "\033[0m"
 
     try:
-        # Initial screen clear and hide cursor
-        display.clear_screen()
-        display.hide_cursor()
+        # Initial screen clear and hide cursor in one write
+        display.begin_frame()
 
-        while True:
-            # Move cursor to home position without clearing (reduce flicker)
-            print("\033[H", end="", flush=True)
+        remaining = max_iterations
+        while remaining is None or remaining > 0:
+            if remaining is not None:
+                remaining -= 1
 
+            # Messages go through the buffer too, so the next frame is diffed against what is on screen
             ccusage_data = data.run_ccusage()
             if not ccusage_data or "blocks" not in ccusage_data:
-                print("Failed to get usage data")
+                display.writeln("Failed to get usage data")
+                display.flush_buffer()
                 continue
 
             # Find the active block
@@ -112,7 +126,8 @@ def main() -> None:
                     break
 
             if not active_block:
-                print("No active session found")
+                display.writeln("No active session found")
+                display.flush_buffer()
                 continue
 
             # Extract data from active block
@@ -131,7 +146,7 @@ def main() -> None:
             # Time calculations
             start_time_str = active_block.get("startTime")
             if start_time_str:
-                start_time = datetime.fromisoformat(start_time_str.replace("Z", "+00:00"))
+                start_time = calculations.parse_iso_time(start_time_str)
                 current_time = datetime.now(start_time.tzinfo)
             else:
                 current_time = datetime.now(timezone.utc)
@@ -290,18 +305,24 @@ def main() -> None:
                 # Clear any remaining lines from previous output
                 print("\033[J", end="", flush=True)
 
-            time.sleep(args.refresh)
+            if remaining != 0:
+                time.sleep(args.refresh)
 
+        # Only reached once max_iterations refreshes have run
+        display.show_cursor()
+        display.flush_frame()
     except KeyboardInterrupt:
         # Show cursor before exiting
         display.show_cursor()
         print(f"\n\n{cyan}Monitoring stopped.{reset}")
         # Clear the terminal
         display.clear_screen()
+        display.flush_frame()
         sys.exit(0)
     except Exception:
         # Show cursor on any error
         display.show_cursor()
+        display.flush_frame()
         raise
 
 
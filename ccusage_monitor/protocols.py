@@ -55,6 +55,10 @@ class DisplayProtocol(Protocol):
 
     def flush_buffer(self) -> None: ...
 
+    def flush_frame(self) -> None: ...
+
+    def begin_frame(self) -> None: ...
+
 
 class DataProtocol(Protocol):
     """A protocol for data modules to ensure type safety."""
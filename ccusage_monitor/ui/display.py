@@ -1,48 +1,124 @@
 """Consolidated display module with optimized terminal UI functions."""
 
+import functools
+import os
+import shutil
 import sys
-from io import StringIO
-from typing import Union, cast
+from typing import Final, List, Optional, Tuple, Union
 
-from ccusage_monitor.core.cache import cache
+from ccusage_monitor.core.config import BLUE, GREEN, RED, RESET
+from ccusage_monitor.ui.frame import frame_diff
+
+# Pre-built fill runs so progress bars are assembled by indexing, not str multiplication
+_MAX_BAR_WIDTH = 256
+_FILLED = tuple("█" * i for i in range(_MAX_BAR_WIDTH))
+_EMPTY = tuple("░" * i for i in range(_MAX_BAR_WIDTH))
+
+
+def _bar_segments(filled: int, width: int) -> Tuple[str, str]:
+    """Return the filled and empty runs of a progress bar."""
+    empty = width - filled
+    if 0 <= filled < _MAX_BAR_WIDTH and 0 <= empty < _MAX_BAR_WIDTH:
+        return _FILLED[filled], _EMPTY[empty]
+    # Out-of-range widths (or overflowing percentages) fall back to multiplication
+    return "█" * filled, "░" * empty
+
+
+def _colored_bar(fill_color: str, filled_run: str, empty_run: str) -> str:
+    """Join colored bar runs, omitting the color code of an empty run."""
+    filled = f"{fill_color}{filled_run}" if filled_run else ""
+    empty = f"{RED}{empty_run}" if empty_run else ""
+    return f"[{filled}{empty}{RESET}]"
 
 
 class OutputBuffer:
-    """Buffer for optimized terminal output."""
+    """Buffer for optimized terminal output.
+
+    Writes are appended to a list and joined once per flush.
+    """
 
     def __init__(self) -> None:
-        self.buffer: StringIO = StringIO()
+        self.parts: List[str] = []
         self.last_output: str = ""
 
     def write(self, text: str) -> None:
         """Add text to buffer."""
-        self.buffer.write(text)
+        self.parts.append(text)
 
     def writeln(self, text: str = "") -> None:
         """Add text with newline to buffer."""
-        self.buffer.write(text + "\n")
+        self.parts.append(text)
+        self.parts.append("\n")
+
+    def invalidate(self) -> None:
+        """Forget the frame on screen, so the next flush redraws it whole."""
+        self.last_output = ""
+
+    def getvalue(self) -> str:
+        """Return the buffered text."""
+        return "".join(self.parts)
 
     def flush(self) -> None:
         """Flush buffer to stdout only if content changed."""
-        current_output = self.buffer.getvalue()
+        current_output = self.getvalue()
+        self.parts.clear()
 
         # Only update screen if content actually changed
         if current_output != self.last_output:
-            # Move cursor to top
-            print("\033[H", end="", flush=False)
-            # Write all at once
-            sys.stdout.write(current_output)
-            # Clear remaining lines
-            print("\033[J", end="", flush=True)
+            _emit(frame_diff(self.last_output, current_output, shutil.get_terminal_size().columns))
             self.last_output = current_output
 
-        # Reset buffer
-        self.buffer = StringIO()
+        # Single write for queued control sequences and the frame
+        flush_frame()
 
 
 # Global buffer instance
 _buffer = OutputBuffer()
 
+# Terminal output queued until the next flush_frame()
+_pending: List[str] = []
+
+
+def _emit(seq: str) -> None:
+    """Queue terminal output for the next frame write."""
+    _pending.append(seq)
+
+
+def _stdout_fd() -> Optional[int]:
+    """Return stdout's file descriptor when frames can be written to it directly."""
+    if os.name != "posix":
+        # Windows consoles need the text layer to translate output
+        return None
+    try:
+        return sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        # Replaced or in-memory streams (io.UnsupportedOperation is both)
+        return None
+
+
+def flush_frame() -> None:
+    """Write all queued terminal output with a single write.
+
+    On a POSIX file descriptor the frame goes out through one os.write()
+    call, bypassing the text layer; otherwise through sys.stdout.
+    """
+    if not _pending:
+        return
+    text = "".join(_pending)
+    _pending.clear()
+
+    fd = _stdout_fd()
+    if fd is None:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+        return
+
+    # Anything print()ed earlier must reach the terminal before the frame
+    sys.stdout.flush()
+    data = memoryview(text.encode(sys.stdout.encoding or "utf-8"))
+    while data:
+        data = data[os.write(fd, data) :]
+
 
 def write_to_buffer(text: str) -> None:
     """Public interface to write to buffer."""
@@ -59,108 +135,112 @@ def flush_buffer() -> None:
     _buffer.flush()
 
 
-def print_header() -> None:
-    """Print header with caching."""
-    # Header doesn't change, so cache it
-    cached = cache.get("header_output")
-    if cached is None:
-        cyan = "\033[96m"
-        blue = "\033[94m"
-        reset = "\033[0m"
-        sparkles = f"{cyan}✦ ✧ ✦ ✧ {reset}"
+def invalidate_frame() -> None:
+    """Redraw the next frame whole, after something else wrote to the terminal."""
+    _buffer.invalidate()
+
 
-        header_str = f"{sparkles}{cyan}CLAUDE TOKEN MONITOR{reset} {sparkles}\n{blue}{'=' * 60}{reset}\n\n"
-        cache.set("header_output", header_str)
-        cached = header_str
+def _build_header() -> str:
+    """Build the header string; it never changes."""
+    cyan = "\033[96m"
+    blue = "\033[94m"
+    reset = "\033[0m"
+    sparkles = f"{cyan}✦ ✧ ✦ ✧ {reset}"
 
-    write_to_buffer(cast(str, cached))
+    return f"{sparkles}{cyan}CLAUDE TOKEN MONITOR{reset} {sparkles}\n{blue}{'=' * 60}{reset}\n\n"
+
+
+_HEADER: Final[str] = _build_header()
+
+
+def print_header() -> None:
+    """Print the header built at import."""
+    write_to_buffer(_HEADER)
 
 
 def create_token_progress_bar(percentage: float, width: int = 50) -> str:
-    """Create token progress bar with caching for common values."""
-    # Round percentage to reduce cache entries
-    rounded_pct = round(percentage, 1)
-    cache_key = f"token_bar_{rounded_pct}_{width}"
+    """Create token progress bar, memoized per tenth of a percent."""
+    return _token_bar(round(percentage * 10), width)
 
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return cast(str, cached)
 
+@functools.lru_cache(maxsize=2048)
+def _token_bar(pct_tenths: int, width: int) -> str:
+    """Build a token progress bar for a percentage given in tenths."""
+    percentage = pct_tenths / 10
     filled = int(width * percentage / 100)
-    green_bar = "█" * filled
-    red_bar = "░" * (width - filled)
+    green_bar, red_bar = _bar_segments(filled, width)
 
-    # Use pre-defined color codes
-    result = f"🟢 [\033[92m{green_bar}\033[91m{red_bar}\033[0m] {percentage:.1f}%"
-    cache.set(cache_key, result)
-    return result
+    return f"🟢 {_colored_bar(GREEN, green_bar, red_bar)} {percentage:.1f}%"
 
 
 def create_time_progress_bar(
     elapsed_minutes: Union[int, float], total_minutes: Union[int, float], width: int = 50
 ) -> str:
-    """Create time progress bar with caching."""
-    percentage = 0 if total_minutes <= 0 else min(100, (elapsed_minutes / total_minutes) * 100)
+    """Create time progress bar, memoized per whole minute."""
+    return _time_bar(round(elapsed_minutes), round(total_minutes), width)
 
-    # Round values for better caching
-    rounded_elapsed = round(elapsed_minutes)
-    cache_key = f"time_bar_{rounded_elapsed}_{total_minutes}_{width}"
 
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return cast(str, cached)
+@functools.lru_cache(maxsize=2048)
+def _time_bar(elapsed_minutes: int, total_minutes: int, width: int) -> str:
+    """Build a time progress bar for whole-minute elapsed and total durations."""
+    percentage = 0 if total_minutes <= 0 else min(100, (elapsed_minutes / total_minutes) * 100)
 
     filled = int(width * percentage / 100)
-    blue_bar = "█" * filled
-    red_bar = "░" * (width - filled)
+    blue_bar, red_bar = _bar_segments(filled, width)
 
     remaining_time = format_time(max(0, total_minutes - elapsed_minutes))
-    result = f"⏰ [\033[94m{blue_bar}\033[91m{red_bar}\033[0m] {remaining_time}"
-    cache.set(cache_key, result)
-    return result
+    return f"⏰ {_colored_bar(BLUE, blue_bar, red_bar)} {remaining_time}"
 
 
 def format_time(minutes: Union[int, float]) -> str:
     """Format time with caching."""
-    # Round to nearest minute for better caching
-    rounded_minutes = round(minutes)
+    # Round to nearest minute so the memoized formatter sees a small int key space
+    return _format_time_int(round(minutes))
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_time_int(minutes: int) -> str:
+    """Format a whole number of minutes as e.g. "45m", "2h" or "2h 5m"."""
+    if minutes < 60:
+        return f"{minutes}m"
+
+    hours, mins = divmod(minutes, 60)
+    return f"{hours}h" if mins == 0 else f"{hours}h {mins}m"
+
 
-    cached = cache.get(f"time_format_{rounded_minutes}")
-    if cached is not None:
-        return cast(str, cached)
+# Hide cursor, clear screen and scrollback, move home: the start of a session
+FRAME_PREFIX = "\033[?25l\033[2J\033[3J\033[H"
 
-    if rounded_minutes < 60:
-        result = f"{rounded_minutes}m"
-    else:
-        hours = rounded_minutes // 60
-        mins = rounded_minutes % 60
-        result = f"{hours}h" if mins == 0 else f"{hours}h {mins}m"
 
-    cache.set(f"time_format_{rounded_minutes}", result)
-    return result
+def begin_frame() -> None:
+    """Hide the cursor and clear the screen with a single write."""
+    _buffer.invalidate()
+    _emit(FRAME_PREFIX)
+    flush_frame()
 
 
 def clear_screen() -> None:
-    """Clear the terminal screen."""
+    """Clear the terminal screen (written on the next flush_frame)."""
     # Use ANSI escape codes for better compatibility
-    print("\033[2J\033[3J\033[H", end="", flush=True)
+    _buffer.invalidate()
+    _emit("\033[2J\033[3J\033[H")
 
 
 def hide_cursor() -> None:
-    """Hide cursor."""
-    print("\033[?25l", end="", flush=True)
+    """Hide cursor (written on the next flush_frame)."""
+    _emit("\033[?25l")
 
 
 def show_cursor() -> None:
-    """Show cursor."""
-    print("\033[?25h", end="", flush=True)
+    """Show cursor (written on the next flush_frame)."""
+    _emit("\033[?25h")
 
 
 def move_cursor_to_top() -> None:
-    """Move cursor to top (handled by buffer now)."""
-    pass  # Buffer handles this
+    """Move cursor to top (written on the next flush_frame)."""
+    _emit("\033[H")
 
 
 def clear_below_cursor() -> None:
-    """Clear below cursor (handled by buffer now)."""
-    pass  # Buffer handles this
+    """Clear below cursor (written on the next flush_frame)."""
+    _emit("\033[J")
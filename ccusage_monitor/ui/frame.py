@@ -0,0 +1,67 @@
+"""Row-level diffing between terminal frames."""
+
+import functools
+import re
+import unicodedata
+from typing import List
+
+# CSI escape sequences (colors, cursor moves) take up no columns on screen
+_CSI = re.compile(r"\033\[[0-9;?]*[A-Za-z]")
+
+
+@functools.lru_cache(maxsize=256)
+def line_width(line: str) -> int:
+    """Return the terminal columns a frame line occupies.
+
+    Wide and fullwidth characters count as two columns. Ambiguous-width ones,
+    such as the bar glyphs, count as one, as they render outside CJK locales.
+    """
+    text = _CSI.sub("", line.rstrip("\n"))
+    return sum(2 if unicodedata.east_asian_width(char) in "WF" else 1 for char in text)
+
+
+def _fits_rows(lines: List[str], columns: int) -> bool:
+    """Return True if no line can reach the last column and wrap onto a second row."""
+    return all(line_width(line) < columns for line in lines)
+
+
+def frame_diff(old: str, new: str, columns: int) -> str:
+    """Return the output that turns frame old into new on screen.
+
+    The screen must still show old exactly; anything that writes to the
+    terminal outside OutputBuffer has to invalidate the buffer first.
+
+    When both frames have the same number of lines, only the changed lines
+    are erased and rewritten in place; the last line is always rewritten so
+    the cursor ends where a full redraw would leave it. Otherwise the cursor
+    moves to the first changed line and the rest of the frame is written.
+    Either way anything below the frame is cleared, so stray output printed
+    between frames never lingers.
+
+    Both rely on each line taking exactly one row, so when a line of either
+    frame could wrap at the given terminal width, the whole frame is redrawn.
+    """
+    old_lines = old.splitlines(True)
+    new_lines = new.splitlines(True)
+    rows = len(new_lines)
+
+    if not (_fits_rows(old_lines, columns) and _fits_rows(new_lines, columns)):
+        # A wrapped line shifts every row below it, so absolute rows can't be trusted
+        return f"\033[H{new}\033[J"
+
+    if old_lines and len(old_lines) == rows:
+        changed = "".join(
+            f"\033[{row};1H\033[2K{new_line}"
+            for row, (old_line, new_line) in enumerate(zip(old_lines, new_lines), 1)
+            if old_line != new_line or row == rows
+        )
+        return f"{changed}\033[J"
+
+    same = 0
+    for old_line, new_line in zip(old_lines, new_lines):
+        if old_line != new_line:
+            break
+        same += 1
+
+    move = f"\033[{same + 1};1H" if same else "\033[H"
+    return f"{move}{''.join(new_lines[same:])}\033[J"
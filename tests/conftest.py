@@ -0,0 +1,103 @@
+"""Shared pytest fixtures."""
+
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
+from typing import Any, Iterator, Mapping
+from unittest.mock import DEFAULT, NonCallableMagicMock, create_autospec, patch
+
+import pytest
+
+import ccusage_monitor.app.main as app_main
+from ccusage_monitor.core import disk_cache
+from ccusage_monitor.protocols import CLIArgs
+from ccusage_monitor.ui import display
+
+# display functions that write terminal control sequences
+_TERMINAL_CONTROLS = ("begin_frame", "clear_screen", "hide_cursor", "show_cursor", "flush_frame")
+
+
+@pytest.fixture(scope="session")
+def _disk_cache_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create one session directory for the on-disk ccusage cache."""
+    return tmp_path_factory.mktemp("ccusage-monitor")
+
+
+@pytest.fixture(autouse=True)
+def _disk_cache(_disk_cache_dir: Path) -> Iterator[Path]:
+    """Keep the on-disk ccusage cache out of the user's home and empty at the start of each test."""
+    path = _disk_cache_dir / "last.json"
+    with patch.object(disk_cache, "_DISK_CACHE", str(path)), patch.object(disk_cache, "_saved_digest", None):
+        yield path
+    if path.exists():
+        path.unlink()
+
+
+@pytest.fixture(scope="session")
+def _display_mock_template() -> NonCallableMagicMock:
+    """Autospec the display module once per session."""
+    return create_autospec(display, spec_set=True)
+
+
+@pytest.fixture
+def display_mocks(_display_mock_template: NonCallableMagicMock) -> Iterator[NonCallableMagicMock]:
+    """Replace display's terminal-control functions with the session's autospecced mocks.
+
+    The mocks are reset after each test instead of being rebuilt, so their
+    calls, return values and side effects never leak into the next test.
+    With flush_frame mocked, frames stay queued in display's real buffer, so
+    the queue and the last frame are cleared on entry and on exit too.
+    """
+    controls = {name: getattr(_display_mock_template, name) for name in _TERMINAL_CONTROLS}
+    pending = display._pending[:]
+    display._pending.clear()
+    display._buffer.__init__()
+    try:
+        with patch.multiple(display, **controls):
+            yield _display_mock_template
+    finally:
+        for mock in controls.values():
+            mock.reset_mock(return_value=True, side_effect=True)
+        display._pending[:] = pending
+        display._buffer.__init__()
+
+
+@pytest.fixture
+def main_mocks(display_mocks: NonCallableMagicMock) -> Iterator[SimpleNamespace]:
+    """Patch the collaborators of app.main's loop in one ExitStack.
+
+    patch.multiple resolves its target once instead of once per stacked
+    @patch decorator, and display is covered by display_mocks. The defaults
+    run the plain monitor on the pro plan (7000 tokens) with ccusage installed
+    and no background refresher. Tests set return values and side effects on the returned
+    namespace, e.g. main_mocks.run_ccusage.return_value.
+    """
+    with ExitStack() as stack:
+        mocks = stack.enter_context(
+            patch.multiple(
+                app_main,
+                parse_args=DEFAULT,
+                check_ccusage_installed=DEFAULT,
+                get_token_limit=DEFAULT,
+                run_ccusage=DEFAULT,
+                start_refresher=DEFAULT,
+                stop_refresher=DEFAULT,
+            )
+        )
+        mocks["parse_args"].return_value = CLIArgs()
+        mocks["check_ccusage_installed"].return_value = True
+        mocks["get_token_limit"].return_value = 7000
+        mocks["sleep"] = stack.enter_context(patch.object(time, "sleep"))
+        yield SimpleNamespace(**mocks)
+
+
+@pytest.fixture(scope="session")
+def sample_active_blocks() -> Mapping[str, Any]:
+    """Return a read-only ccusage payload with one active block.
+
+    main() only reads the payload, so one frozen copy with a fixed start
+    time serves every test.
+    """
+    block = MappingProxyType({"isActive": True, "totalTokens": 5000, "startTime": "2024-01-01T10:00:00Z"})
+    return MappingProxyType({"blocks": (block,)})
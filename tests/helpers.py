@@ -0,0 +1,66 @@
+"""Lightweight helpers shared by the test modules."""
+
+import builtins
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from ccusage_monitor.core import calculations, data
+from ccusage_monitor.core.cache import cache
+from ccusage_monitor.ui import display, frame
+
+PrintCall = Tuple[Tuple[Any, ...], Dict[str, Any]]
+
+
+@contextmanager
+def capture_print() -> Iterator[List[PrintCall]]:
+    """Record print() calls as (args, kwargs) tuples without building a MagicMock."""
+    calls: List[PrintCall] = []
+    original = builtins.print
+    builtins.print = lambda *args, **kwargs: calls.append((args, kwargs))
+    try:
+        yield calls
+    finally:
+        builtins.print = original
+
+
+def printed_text(calls: Sequence[PrintCall]) -> str:
+    """Return the printed arguments of captured calls as one string.
+
+    Also accepts a mock's call_args_list, whose entries unpack the same way.
+    """
+    return "\n".join(" ".join(str(arg) for arg in args) for args, _kwargs in calls)
+
+
+@contextmanager
+def cache_scope() -> Iterator[None]:
+    """Delete only the shared-cache entries added inside the block.
+
+    Cheaper than clearing the whole cache between tests, and leaves entries
+    written by other tests alone.
+    """
+    before = set(cache._cache)
+    try:
+        yield
+    finally:
+        for key in set(cache._cache) - before:
+            cache.delete(key)
+
+
+# Every lru_cache memoizer in the package, cleared together by tests that count cache hits
+_CACHED_FNS = (
+    calculations.parse_iso_time,
+    calculations._get_timezone,
+    calculations._next_reset,
+    data._parse,
+    data.check_ccusage_installed,
+    display._token_bar,
+    display._time_bar,
+    display._format_time_int,
+    frame.line_width,
+)
+
+
+def reset_all_caches() -> None:
+    """Clear every lru_cache memoizer in core.calculations, core.data, ui.display and ui.frame."""
+    for fn in _CACHED_FNS:
+        fn.cache_clear()
@@ -1,11 +1,15 @@
 """Comprehensive tests for ccusage_monitor.app.main module."""
 
 import sys
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+import ccusage_monitor.app.main as app_main
+from ccusage_monitor.app import main_rich
 from ccusage_monitor.app.main import main
+from ccusage_monitor.ui import display
 
 
 def create_mock_args(**overrides):
@@ -25,211 +29,166 @@ def create_mock_args(**overrides):
     return mock_args
 
 
+@pytest.mark.integration
 class TestMainFunction:
     """Test the main application function."""
 
-    @patch("ccusage_monitor.app.main.parse_args")
-    @patch("ccusage_monitor.app.main.check_ccusage_installed")
-    @patch("builtins.print")
-    def test_main_exits_when_ccusage_not_installed(self, mock_print, mock_check, mock_parse):
+    def test_main_exits_when_ccusage_not_installed(self, main_mocks, capsys):
         """Test main exits when ccusage is not installed."""
-        # Mock arguments
-        mock_parse.return_value = create_mock_args()
-
-        # Mock ccusage not installed
-        mock_check.return_value = False
+        main_mocks.check_ccusage_installed.return_value = False
 
         with pytest.raises(SystemExit) as exc_info:
             main()
 
         assert exc_info.value.code == 1
-        mock_check.assert_called_once()
-        mock_print.assert_called()
+        main_mocks.check_ccusage_installed.assert_called_once()
+        assert "Cannot proceed without ccusage" in capsys.readouterr().out
 
-    @patch("ccusage_monitor.app.main.parse_args")
-    @patch("ccusage_monitor.app.main_rich.main_with_args")
-    def test_main_uses_rich_when_requested(self, mock_rich_main, mock_parse):
+    @patch.object(main_rich, "main_with_args")
+    def test_main_uses_rich_when_requested(self, mock_rich_main, main_mocks):
         """Test main uses rich version when requested."""
-        # Mock arguments with rich=True
         mock_args = create_mock_args(rich=True)
-        mock_parse.return_value = mock_args
+        main_mocks.parse_args.return_value = mock_args
 
         main()
 
         mock_rich_main.assert_called_once_with(mock_args)
 
-    @patch("ccusage_monitor.app.main.parse_args")
-    @patch("builtins.print")
-    def test_main_handles_rich_import_error(self, mock_print, mock_parse):
+    def test_main_handles_rich_import_error(self, main_mocks, capsys):
         """Test main handles rich import error gracefully."""
-        mock_parse.return_value = create_mock_args(rich=True)
+        main_mocks.parse_args.return_value = create_mock_args(rich=True)
 
         # Mock import error
-        with patch("ccusage_monitor.app.main_rich.main_with_args", side_effect=ImportError):
+        with patch.object(main_rich, "main_with_args", side_effect=ImportError):
             with pytest.raises(SystemExit) as exc_info:
                 main()
 
         assert exc_info.value.code == 1
-        mock_print.assert_called_with("❌ Rich library not installed. Install with: pip install rich")
-
-    @patch("ccusage_monitor.app.main.parse_args")
-    @patch("ccusage_monitor.app.main.check_ccusage_installed")
-    @patch("ccusage_monitor.app.main.get_token_limit")
-    @patch("ccusage_monitor.app.main.run_ccusage")
-    @patch("ccusage_monitor.app.main.display.clear_screen")
-    @patch("ccusage_monitor.app.main.display.hide_cursor")
-    @patch("time.sleep")
-    def test_main_handles_custom_max_plan(
-        self, mock_sleep, mock_hide, mock_clear, mock_run_ccusage, mock_get_limit, mock_check, mock_parse
-    ):
+        assert capsys.readouterr().out.endswith("❌ Rich library not installed. Install with: pip install rich\n")
+
+    def test_main_handles_custom_max_plan(self, main_mocks, sample_active_blocks):
         """Test main handles custom_max plan correctly."""
-        # Mock arguments
-        mock_args = create_mock_args(plan="custom_max", refresh=0.1)
-        mock_parse.return_value = mock_args
-
-        # Mock ccusage installed
-        mock_check.return_value = True
-
-        # Mock ccusage data with active block
-        mock_data = {"blocks": [{"totalTokens": 5000, "isActive": True, "startTime": "2024-01-01T10:00:00Z"}]}
-        mock_run_ccusage.return_value = mock_data
-
-        # Mock token limit
-        mock_get_limit.return_value = 7000
-
-        # Mock sleep to interrupt the loop after first iteration
-        mock_sleep.side_effect = KeyboardInterrupt()
-
-        with patch("ccusage_monitor.app.main.display.show_cursor"):
-            with patch("ccusage_monitor.app.main.display.clear_screen"):
-                with pytest.raises(SystemExit):
-                    main()
-
-        mock_get_limit.assert_called()
-        mock_run_ccusage.assert_called()
-
-    @patch("ccusage_monitor.app.main.parse_args")
-    @patch("ccusage_monitor.app.main.check_ccusage_installed")
-    @patch("ccusage_monitor.app.main.get_token_limit")
-    @patch("ccusage_monitor.app.main.run_ccusage")
-    @patch("ccusage_monitor.app.main.display.clear_screen")
-    @patch("ccusage_monitor.app.main.display.hide_cursor")
-    @patch("time.sleep")
-    def test_main_handles_failed_ccusage_data(
-        self, mock_sleep, mock_hide, mock_clear, mock_run_ccusage, mock_get_limit, mock_check, mock_parse
-    ):
-        """Test main handles failed ccusage data gracefully."""
-        # Mock arguments
-        mock_args = create_mock_args(plan="pro", refresh=0.1)
-        mock_parse.return_value = mock_args
+        main_mocks.parse_args.return_value = create_mock_args(plan="custom_max", refresh=0.1)
+        main_mocks.run_ccusage.return_value = sample_active_blocks
+
+        main(max_iterations=1)
 
-        mock_check.return_value = True
-        mock_get_limit.return_value = 7000
+        main_mocks.get_token_limit.assert_called()
+        main_mocks.run_ccusage.assert_called()
 
+    def test_main_handles_failed_ccusage_data(self, main_mocks):
+        """Test main handles failed ccusage data gracefully."""
         # Mock failed ccusage call
-        mock_run_ccusage.return_value = None
-
-        # Mock sleep to interrupt after a few iterations
-        mock_sleep.side_effect = KeyboardInterrupt()
-
-        def mock_print(*args, **kwargs):
-            if args and args[0] == "Failed to get usage data":
-                raise KeyboardInterrupt()
-            return None
-
-        with patch("builtins.print", side_effect=mock_print):
-            with patch("ccusage_monitor.app.main.display.show_cursor"):
-                with patch("ccusage_monitor.app.main.display.clear_screen"):
-                    with pytest.raises(SystemExit):
-                        main()
-
-        # Should have tried to get ccusage data
-        assert mock_run_ccusage.call_count >= 1
-
-    @patch("ccusage_monitor.app.main.parse_args")
-    @patch("ccusage_monitor.app.main.check_ccusage_installed")
-    @patch("ccusage_monitor.app.main.get_token_limit")
-    @patch("ccusage_monitor.app.main.run_ccusage")
-    @patch("ccusage_monitor.app.main.display.clear_screen")
-    @patch("ccusage_monitor.app.main.display.hide_cursor")
-    @patch("time.sleep")
-    def test_main_handles_no_active_session(
-        self, mock_sleep, mock_hide, mock_clear, mock_run_ccusage, mock_get_limit, mock_check, mock_parse
-    ):
-        """Test main handles no active session gracefully."""
-        mock_args = create_mock_args(plan="pro", refresh=0.1)
-        mock_parse.return_value = mock_args
+        main_mocks.run_ccusage.return_value = None
 
-        mock_check.return_value = True
-        mock_get_limit.return_value = 7000
+        main(max_iterations=1)
 
+        assert display._buffer.last_output == "Failed to get usage data\n"
+        main_mocks.run_ccusage.assert_called_once()
+
+    def test_main_handles_no_active_session(self, main_mocks):
+        """Test main handles no active session gracefully."""
         # Mock data with no active blocks
-        mock_data = {"blocks": [{"totalTokens": 1000, "isActive": False}]}
-        mock_run_ccusage.return_value = mock_data
+        main_mocks.run_ccusage.return_value = {"blocks": [{"totalTokens": 1000, "isActive": False}]}
 
-        mock_sleep.side_effect = KeyboardInterrupt()
+        main(max_iterations=1)
 
-        def mock_print_no_active(*args, **kwargs):
-            if args and args[0] == "No active session found":
-                raise KeyboardInterrupt()
-            return None
+        assert display._buffer.last_output == "No active session found\n"
+        main_mocks.run_ccusage.assert_called()
 
-        with patch("builtins.print", side_effect=mock_print_no_active):
-            with patch("ccusage_monitor.app.main.display.show_cursor"):
-                with patch("ccusage_monitor.app.main.display.clear_screen"):
-                    with pytest.raises(SystemExit):
-                        main()
+    def test_dashboard_after_message_repaints_from_the_top(self, main_mocks, sample_active_blocks):
+        """Test the frame after a status message redraws the header row the message covered."""
+        main_mocks.run_ccusage.side_effect = [None, sample_active_blocks]
 
-        mock_run_ccusage.assert_called()
+        main(max_iterations=2)
 
-    @patch("ccusage_monitor.app.main.parse_args")
-    @patch("ccusage_monitor.app.main.check_ccusage_installed")
-    @patch("ccusage_monitor.app.main.display.show_cursor")
-    def test_main_handles_keyboard_interrupt(self, mock_show, mock_check, mock_parse):
-        """Test main handles KeyboardInterrupt gracefully."""
-        mock_args = create_mock_args()
-        mock_parse.return_value = mock_args
+        message, dashboard = display._pending
+        assert message == "\033[HFailed to get usage data\n\033[J"
+        assert dashboard.startswith(f"\033[H{display._HEADER}")
+
+    def test_main_stops_after_max_iterations(self, main_mocks, display_mocks, sample_active_blocks):
+        """Test main returns after max_iterations refreshes without sleeping past the last one."""
+        main_mocks.run_ccusage.return_value = sample_active_blocks
+
+        main(max_iterations=3)
+
+        assert main_mocks.run_ccusage.call_count == 3
+        assert main_mocks.sleep.call_count == 2
+        display_mocks.show_cursor.assert_called_once()
+        main_mocks.stop_refresher.assert_called_once()
+
+    @pytest.fixture
+    def clock(self, main_mocks):
+        """Drive time.time() from the mocked sleep, starting at the top of a minute."""
+        now = [600.0]
+        main_mocks.sleep.side_effect = lambda seconds: now.__setitem__(0, now[0] + seconds)
+        with patch.object(time, "time", side_effect=lambda: now[0]):
+            yield now
+
+    @pytest.fixture
+    def render_spy(self):
+        """Spy on the dashboard renderer while keeping its output."""
+        with patch.object(app_main, "_render_dashboard", wraps=app_main._render_dashboard) as spy:
+            yield spy
+
+    @pytest.mark.usefixtures("clock")
+    def test_unchanged_data_renders_once_per_minute(self, main_mocks, render_spy, sample_active_blocks):
+        """Test identical data is only re-rendered when the minute ticks over."""
+        main_mocks.parse_args.return_value = create_mock_args(refresh=10)
+        main_mocks.run_ccusage.return_value = sample_active_blocks
 
-        mock_check.return_value = True
+        # Ticks at 600..670s: six in minute 10, two in minute 11
+        main(max_iterations=8)
 
+        assert main_mocks.run_ccusage.call_count == 8
+        assert render_spy.call_count == 2
+
+    @pytest.mark.usefixtures("clock")
+    def test_changed_data_renders_within_the_minute(self, main_mocks, render_spy, sample_active_blocks):
+        """Test new data is rendered on the tick it arrives, without waiting for the next minute."""
+        main_mocks.parse_args.return_value = create_mock_args(refresh=1)
+        busier = {"blocks": [dict(sample_active_blocks["blocks"][0], totalTokens=6000)]}
+        main_mocks.run_ccusage.side_effect = [sample_active_blocks, sample_active_blocks, busier]
+
+        main(max_iterations=3)
+
+        assert render_spy.call_count == 2
+        assert render_spy.call_args.args[2]["totalTokens"] == 6000
+
+    @pytest.mark.usefixtures("main_mocks")
+    def test_main_handles_keyboard_interrupt(self, display_mocks):
+        """Test main handles KeyboardInterrupt gracefully."""
         # Mock KeyboardInterrupt in the main loop
-        with patch("ccusage_monitor.app.main.display.clear_screen"):
-            with patch("ccusage_monitor.app.main.display.hide_cursor", side_effect=KeyboardInterrupt):
-                with patch("ccusage_monitor.app.main.display.clear_screen"):
-                    with patch("builtins.print"):
-                        with pytest.raises(SystemExit) as exc_info:
-                            main()
+        display_mocks.begin_frame.side_effect = KeyboardInterrupt
+        with pytest.raises(SystemExit) as exc_info:
+            main()
 
         assert exc_info.value.code == 0
-        mock_show.assert_called_once()  # Should show cursor before exit
+        display_mocks.show_cursor.assert_called_once()  # Should show cursor before exit
 
-    @patch("ccusage_monitor.app.main.parse_args")
-    @patch("ccusage_monitor.app.main.check_ccusage_installed")
-    @patch("ccusage_monitor.app.main.display.show_cursor")
-    def test_main_handles_general_exception(self, mock_show, mock_check, mock_parse):
+    @pytest.mark.usefixtures("main_mocks")
+    def test_main_handles_general_exception(self, display_mocks):
         """Test main shows cursor on general exception."""
-        mock_args = create_mock_args()
-        mock_parse.return_value = mock_args
+        # Mock general exception in the main loop
+        display_mocks.begin_frame.side_effect = RuntimeError("Test error")
+        with pytest.raises(RuntimeError):
+            main()
 
-        mock_check.return_value = True
+        display_mocks.show_cursor.assert_called_once()  # Should show cursor before re-raising
 
-        # Mock general exception in the main loop
-        with patch("ccusage_monitor.app.main.display.hide_cursor", side_effect=RuntimeError("Test error")):
-            with pytest.raises(RuntimeError):
-                main()
+    def test_main_stops_refresher_on_exit(self, main_mocks, display_mocks):
+        """Test the background refresher is started and stopped around the loop."""
+        display_mocks.begin_frame.side_effect = RuntimeError("Test error")
+        with pytest.raises(RuntimeError):
+            main()
 
-        mock_show.assert_called_once()  # Should show cursor before re-raising
+        main_mocks.start_refresher.assert_called_once_with(3)
+        main_mocks.stop_refresher.assert_called_once()
 
 
 class TestMainIntegration:
     """Integration tests for main function."""
 
-    def test_main_can_be_imported(self):
-        """Test that main function can be imported without errors."""
-        from ccusage_monitor.app.main import main
-
-        assert callable(main)
-
     def test_main_module_execution(self):
         """Test main module can be executed."""
         # This test ensures the if __name__ == "__main__": main() works
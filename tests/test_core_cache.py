@@ -1,11 +1,12 @@
 """Comprehensive tests for ccusage_monitor.core.cache module."""
 
 import time
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
-from ccusage_monitor.core.cache import Cache, cache
+from ccusage_monitor.core.cache import DEFAULT_MAXSIZE, Cache, cache
+from tests.helpers import cache_scope
 
 
 class TestCache:
@@ -14,7 +15,7 @@ class TestCache:
     def test_cache_initialization(self):
         """Test cache initializes correctly."""
         test_cache = Cache()
-        assert len(test_cache._cache) == 0
+        assert len(test_cache) == 0
 
     def test_cache_set_and_get(self):
         """Test basic set and get operations."""
@@ -41,7 +42,7 @@ class TestCache:
         test_cache = Cache()
 
         # Mock time to simulate expiration
-        with patch("ccusage_monitor.core.cache.time.time") as mock_time:
+        with patch.object(time, "time") as mock_time:
             # Set initial time when value was stored
             original_time = 1000.0
             mock_time.return_value = original_time
@@ -57,7 +58,7 @@ class TestCache:
         """Test cache value within TTL."""
         test_cache = Cache()
 
-        with patch("ccusage_monitor.core.cache.time.time") as mock_time:
+        with patch.object(time, "time") as mock_time:
             original_time = 1000.0
             mock_time.return_value = original_time
 
@@ -67,6 +68,18 @@ class TestCache:
             mock_time.return_value = original_time + 0.5
             assert test_cache.get("key1", ttl=1) == "value1"
 
+    def test_cache_delete(self):
+        """Test deleting a single entry, including a missing one."""
+        test_cache = Cache()
+
+        test_cache.set("key1", "value1")
+        test_cache.set("key2", "value2")
+        test_cache.delete("key1")
+        test_cache.delete("missing")
+
+        assert test_cache.get("key1") is None
+        assert test_cache.get("key2") == "value2"
+
     def test_cache_clear(self):
         """Test clearing cache."""
         test_cache = Cache()
@@ -75,7 +88,7 @@ class TestCache:
         test_cache.set("key2", "value2")
 
         test_cache.clear()
-        assert len(test_cache._cache) == 0
+        assert len(test_cache) == 0
         assert test_cache.get("key1") is None
         assert test_cache.get("key2") is None
 
@@ -99,11 +112,45 @@ class TestCache:
             test_cache.set(key, value)
             assert test_cache.get(key) == value
 
+    def test_cache_is_bounded(self):
+        """Test inserting past maxsize evicts the oldest entries."""
+        test_cache = Cache()
+
+        for i in range(DEFAULT_MAXSIZE + 10):
+            test_cache.set(f"key{i}", i)
+
+        assert len(test_cache) == DEFAULT_MAXSIZE
+        assert test_cache.get("key0") is None
+        assert test_cache.get(f"key{DEFAULT_MAXSIZE + 9}") == DEFAULT_MAXSIZE + 9
+
+    def test_cache_len(self):
+        """Test len() counts entries and stays within maxsize for unbounded float keys."""
+        test_cache = Cache()
+        assert len(test_cache) == 0
+
+        for i in range(4 * DEFAULT_MAXSIZE):
+            test_cache.set(f"burn_rate_{i / 7}", float(i))
+
+        assert len(test_cache) == DEFAULT_MAXSIZE
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test reads keep an entry from being evicted."""
+        test_cache = Cache(maxsize=2)
+
+        test_cache.set("hot", 1)
+        test_cache.set("cold", 2)
+        test_cache.get("hot")
+        test_cache.set("new", 3)
+
+        assert test_cache.get("hot") == 1
+        assert test_cache.get("cold") is None
+        assert test_cache.get("new") == 3
+
     def test_cache_no_ttl_means_no_expiration(self):
         """Test that TTL=0 means no expiration check."""
         test_cache = Cache()
 
-        with patch("time.time") as mock_time:
+        with patch.object(time, "time") as mock_time:
             original_time = time.time()
             mock_time.return_value = original_time
 
@@ -117,6 +164,51 @@ class TestCache:
             assert test_cache.get("key1", ttl=0) == "value1"
 
 
+class TestGetOrSet:
+    """Test the Cache.get_or_set method."""
+
+    def test_miss_calls_loader_and_stores(self):
+        """Test that a miss populates the cache from the loader."""
+        test_cache = Cache()
+        loader = MagicMock(return_value="loaded")
+
+        assert test_cache.get_or_set("key1", loader) == "loaded"
+        assert test_cache.get("key1") == "loaded"
+        loader.assert_called_once()
+
+    def test_hit_skips_loader(self):
+        """Test that a hit returns the cached value without loading."""
+        test_cache = Cache()
+        test_cache.set("key1", "cached")
+        loader = MagicMock(return_value="loaded")
+
+        assert test_cache.get_or_set("key1", loader) == "cached"
+        loader.assert_not_called()
+
+    @pytest.mark.parametrize("value", [False, None, 0, ""])
+    def test_falsy_values_are_hits(self, value):
+        """Test that falsy cached values are not mistaken for misses."""
+        test_cache = Cache()
+        loader = MagicMock(return_value=value)
+
+        test_cache.get_or_set("key1", loader)
+        test_cache.get_or_set("key1", loader)
+
+        loader.assert_called_once()
+
+    def test_expired_entry_reloads(self):
+        """Test that an expired entry is reloaded."""
+        test_cache = Cache()
+        loader = MagicMock(side_effect=["first", "second"])
+
+        with patch.object(time, "time") as mock_time:
+            mock_time.return_value = 1000.0
+            assert test_cache.get_or_set("key1", loader, ttl=1) == "first"
+
+            mock_time.return_value = 1000.0 + 2
+            assert test_cache.get_or_set("key1", loader, ttl=1) == "second"
+
+
 class TestGlobalCacheInstance:
     """Test the global cache instance."""
 
@@ -127,24 +219,21 @@ class TestGlobalCacheInstance:
 
     def test_global_cache_basic_operations(self):
         """Test basic operations on global cache."""
-        # Clear cache first
-        cache.clear()
-
-        cache.set("test_key", "test_value")
-        assert cache.get("test_key") == "test_value"
+        with cache_scope():
+            cache.set("test_key", "test_value")
+            assert cache.get("test_key") == "test_value"
 
-        cache.clear()  # Clean up
+        assert cache.get("test_key") is None
 
     def test_global_cache_persistence_across_imports(self):
         """Test that global cache persists across module imports."""
-        cache.clear()
-        cache.set("persistent_key", "persistent_value")
+        with cache_scope():
+            cache.set("persistent_key", "persistent_value")
 
-        # Re-import the module
-        from ccusage_monitor.core.cache import cache as cache2
+            # Re-import the module
+            from ccusage_monitor.core.cache import cache as cache2
 
-        assert cache2.get("persistent_key") == "persistent_value"
-        cache.clear()  # Clean up
+            assert cache2.get("persistent_key") == "persistent_value"
 
 
 if __name__ == "__main__":
@@ -1,17 +1,46 @@
 """Comprehensive tests for ccusage_monitor.core.calculations module."""
 
 from datetime import datetime, timedelta, timezone
+from typing import List
 from unittest.mock import patch
 
 import pytest
 
+from ccusage_monitor.core.cache import cache
 from ccusage_monitor.core.calculations import (
     VELOCITY_INDICATORS,
+    _get_timezone,
+    _next_reset,
     calculate_hourly_burn_rate,
     get_next_reset_time,
     get_token_limit,
     get_velocity_indicator,
+    parse_iso_time,
 )
+from ccusage_monitor.protocols import CcusageBlock
+from tests.helpers import cache_scope, reset_all_caches
+
+# Fixed "now" for tests that build timestamps around the current time
+_FIXED_NOW = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def _cache_scope():
+    """Drop shared-cache entries written by each test; results are keyed on the fixed test time."""
+    with cache_scope():
+        yield
+
+
+class TestParseIsoTime:
+    """Test the parse_iso_time function."""
+
+    def test_parses_zulu_suffix_as_utc(self):
+        """Test a trailing Z is read as UTC."""
+        assert parse_iso_time("2024-01-01T12:00:00Z") == _FIXED_NOW
+
+    def test_repeated_strings_are_memoized(self):
+        """Test the same timestamp string is parsed once and then served from the cache."""
+        assert parse_iso_time("2024-01-01T10:00:00Z") is parse_iso_time("2024-01-01T10:00:00Z")
 
 
 class TestCalculateHourlyBurnRate:
@@ -19,20 +48,18 @@ class TestCalculateHourlyBurnRate:
 
     def test_empty_blocks_returns_zero(self):
         """Test that empty blocks list returns 0 burn rate."""
-        current_time = datetime.now(timezone.utc)
-        burn_rate = calculate_hourly_burn_rate([], current_time)
-        assert burn_rate == 0.0
+        assert calculate_hourly_burn_rate([], _FIXED_NOW) == 0.0
 
     def test_no_active_blocks_returns_zero(self):
         """Test that blocks without active sessions return 0."""
-        current_time = datetime.now(timezone.utc)
+        current_time = _FIXED_NOW
         blocks = [{"isGap": True, "totalTokens": 100}, {"isActive": False, "totalTokens": 200, "startTime": None}]
         burn_rate = calculate_hourly_burn_rate(blocks, current_time)
         assert burn_rate == 0.0
 
     def test_single_active_block_calculation(self):
         """Test burn rate calculation with single active block."""
-        current_time = datetime.now(timezone.utc)
+        current_time = _FIXED_NOW
         start_time = current_time - timedelta(minutes=30)  # 30 minutes ago
 
         blocks = [
@@ -49,7 +76,7 @@ class TestCalculateHourlyBurnRate:
 
     def test_multiple_blocks_in_last_hour(self):
         """Test burn rate with multiple blocks within last hour."""
-        current_time = datetime.now(timezone.utc)
+        current_time = _FIXED_NOW
 
         blocks = [
             {
@@ -75,10 +102,10 @@ class TestCalculateHourlyBurnRate:
 
     def test_blocks_outside_hour_window_ignored(self):
         """Test that blocks outside 1-hour window are ignored."""
-        current_time = datetime.now(timezone.utc)
+        current_time = _FIXED_NOW
         old_time = current_time - timedelta(hours=2)
 
-        blocks = [
+        blocks: List[CcusageBlock] = [
             {
                 "isActive": False,
                 "totalTokens": 1000,
@@ -98,9 +125,24 @@ class TestCalculateHourlyBurnRate:
         # Only the recent block should count: 300 tokens / 30 minutes = 10
         assert burn_rate == 10.0
 
+    def test_completed_block_straddling_window_is_prorated(self):
+        """Test only the part of a completed block inside the last hour counts."""
+        blocks = [
+            {
+                "isActive": False,
+                "totalTokens": 600,
+                "startTime": (_FIXED_NOW - timedelta(minutes=90)).isoformat(),
+                "actualEndTime": (_FIXED_NOW - timedelta(minutes=30)).isoformat(),
+                "isGap": False,
+            }
+        ]
+
+        # 30 of the block's 60 minutes fall inside the hour: 300 tokens / 30 minutes = 10
+        assert calculate_hourly_burn_rate(blocks, _FIXED_NOW) == 10.0
+
     def test_gap_blocks_ignored(self):
         """Test that gap blocks are ignored in calculation."""
-        current_time = datetime.now(timezone.utc)
+        current_time = _FIXED_NOW
 
         blocks = [
             {"isGap": True, "totalTokens": 1000, "startTime": (current_time - timedelta(minutes=30)).isoformat()},
@@ -116,11 +158,11 @@ class TestCalculateHourlyBurnRate:
         # Only non-gap block: 300 tokens / 15 minutes = 20
         assert burn_rate == 20.0
 
-    @patch("ccusage_monitor.core.cache.cache.get")
-    @patch("ccusage_monitor.core.cache.cache.set")
+    @patch.object(cache, "get")
+    @patch.object(cache, "set")
     def test_caching_mechanism(self, mock_set, mock_get):
         """Test that results are cached properly."""
-        current_time = datetime.now(timezone.utc)
+        current_time = _FIXED_NOW
         mock_get.return_value = 15.5  # Cached value
 
         blocks = [
@@ -145,9 +187,7 @@ class TestGetNextResetTime:
 
     def test_next_reset_time_is_future(self):
         """Test that next reset time is always in the future."""
-        current_time = datetime.now(timezone.utc)
-        reset_time = get_next_reset_time(current_time)
-        assert reset_time > current_time
+        assert get_next_reset_time(_FIXED_NOW, None, "Europe/Warsaw") > _FIXED_NOW
 
     def test_custom_reset_hour(self):
         """Test reset time with custom hour."""
@@ -187,34 +227,45 @@ class TestGetNextResetTime:
 
     def test_invalid_timezone_fallback(self):
         """Test fallback to Europe/Warsaw for invalid timezone."""
-        current_time = datetime.now(timezone.utc)
+        current_time = _FIXED_NOW
         reset_time = get_next_reset_time(current_time, timezone_str="Invalid/Timezone")
 
         # Should not raise error and return valid time
         assert reset_time > current_time
 
-    @patch("ccusage_monitor.core.cache.cache.get")
-    @patch("ccusage_monitor.core.cache.cache.set")
-    def test_caching_mechanism(self, mock_set, mock_get):
-        """Test that reset times are cached."""
-        current_time = datetime.now(timezone.utc)
-        cached_time = (current_time + timedelta(hours=1)).isoformat()
-        mock_get.return_value = cached_time
+    def test_timezone_lookup_is_memoized(self):
+        """Test timezone names resolve once, with unknown names mapped to Europe/Warsaw."""
+        assert _get_timezone("US/Eastern") is _get_timezone("US/Eastern")
+        assert _get_timezone("Invalid/Timezone").zone == "Europe/Warsaw"
 
-        reset_time = get_next_reset_time(current_time)
+    def test_caching_mechanism(self):
+        """Test refreshes within the same hour reuse the memoized reset time."""
+        reset_all_caches()
+
+        first = get_next_reset_time(_FIXED_NOW.replace(minute=5))
+        second = get_next_reset_time(_FIXED_NOW.replace(minute=40, second=17))
+
+        assert first is second
+        info = _next_reset.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+    def test_cached_reset_respects_date_and_top_of_hour(self):
+        """Test the same hour on another day, or exactly on a reset hour, is not served stale."""
+        at_reset = datetime(2024, 1, 1, 14, 0, tzinfo=timezone.utc)
+        just_after = at_reset.replace(minute=1)
 
-        mock_get.assert_called()
-        assert reset_time.isoformat() == cached_time
+        assert get_next_reset_time(at_reset) == at_reset
+        assert get_next_reset_time(just_after) == at_reset.replace(hour=18)
+        assert get_next_reset_time(just_after + timedelta(days=1)) == at_reset.replace(day=2, hour=18)
 
 
 class TestGetTokenLimit:
     """Test the get_token_limit function."""
 
-    def test_known_plan_limits(self):
+    @pytest.mark.parametrize("plan,limit", [("pro", 7000), ("max5", 35000), ("max20", 140000)])
+    def test_known_plan_limits(self, plan, limit):
         """Test token limits for known plans."""
-        assert get_token_limit("pro") == 7000
-        assert get_token_limit("max5") == 35000
-        assert get_token_limit("max20") == 140000
+        assert get_token_limit(plan) == limit
 
     def test_unknown_plan_defaults_to_pro(self):
         """Test that unknown plan defaults to pro limit."""
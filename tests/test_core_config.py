@@ -1,10 +1,11 @@
 """Comprehensive tests for ccusage_monitor.core.config module."""
 
-from unittest.mock import patch
+import sys
 
 import pytest
 
 from ccusage_monitor.core.config import (
+    BLUE,
     CYAN,
     DEFAULT_TIMEZONE,
     GRAY,
@@ -15,6 +16,7 @@ from ccusage_monitor.core.config import (
     TOKEN_LIMITS,
     WHITE,
     YELLOW,
+    _build_parser,
     parse_args,
 )
 
@@ -24,7 +26,7 @@ class TestConstants:
 
     def test_color_constants_are_strings(self):
         """Test that all color constants are strings."""
-        colors = [CYAN, RED, YELLOW, WHITE, GRAY, GREEN, RESET]
+        colors = [CYAN, RED, YELLOW, WHITE, GRAY, GREEN, BLUE, RESET]
         for color in colors:
             assert isinstance(color, str)
             assert len(color) > 0
@@ -54,22 +56,21 @@ class TestConstants:
 class TestParseArgs:
     """Test command line argument parsing."""
 
-    def test_parse_args_with_defaults(self):
-        """Test parsing with default arguments."""
-        with patch("sys.argv", ["ccusage-monitor"]):
-            args = parse_args()
+    def test_parser_is_built_once(self, monkeypatch):
+        """Test the argument parser is memoized while each call still reads sys.argv."""
+        monkeypatch.setattr(sys, "argv", ["ccusage-monitor", "--plan", "max20"])
+        first = parse_args()
+        monkeypatch.setattr(sys, "argv", ["ccusage-monitor"])
+        second = parse_args()
 
-        assert args.plan == "pro"
-        assert args.timezone == "Europe/Warsaw"
-        assert args.refresh == 3
-        assert args.performance is False
-        assert args.rich is False
-        assert args.reset_hour is None
+        assert _build_parser() is _build_parser()
+        assert (first.plan, second.plan) == ("max20", "pro")
 
-    def test_parse_args_with_all_options(self):
+    def test_parse_args_with_all_options(self, monkeypatch):
         """Test parsing with all command line options."""
-        with patch(
-            "sys.argv",
+        monkeypatch.setattr(
+            sys,
+            "argv",
             [
                 "ccusage-monitor",
                 "--plan",
@@ -83,8 +84,8 @@ class TestParseArgs:
                 "--refresh",
                 "5",
             ],
-        ):
-            args = parse_args()
+        )
+        args = parse_args()
 
         assert args.plan == "max5"
         assert args.reset_hour == 12
@@ -93,39 +94,34 @@ class TestParseArgs:
         assert args.rich is True
         assert args.refresh == 5
 
-    def test_parse_args_plan_choices(self):
-        """Test that plan argument accepts only valid choices."""
-        valid_plans = ["pro", "max5", "max20", "custom_max"]
-
-        for plan in valid_plans:
-            with patch("sys.argv", ["ccusage-monitor", "--plan", plan]):
-                args = parse_args()
-                assert args.plan == plan
-
-    def test_parse_args_invalid_plan_raises_error(self):
-        """Test that invalid plan raises SystemExit."""
-        with patch("sys.argv", ["ccusage-monitor", "--plan", "invalid"]):
-            with pytest.raises(SystemExit):
-                parse_args()
-
-    def test_parse_args_reset_hour_range(self):
-        """Test reset hour argument accepts valid range."""
-        # Test valid hours
-        for hour in [0, 12, 23]:
-            with patch("sys.argv", ["ccusage-monitor", "--reset-hour", str(hour)]):
-                args = parse_args()
-                assert args.reset_hour == hour
-
-    def test_parse_args_refresh_interval(self):
-        """Test refresh interval argument."""
-        with patch("sys.argv", ["ccusage-monitor", "--refresh", "10"]):
-            args = parse_args()
-            assert args.refresh == 10
-
-    def test_parse_args_returns_cliargs_protocol(self):
+    @pytest.mark.parametrize(
+        "options,attr,expected",
+        [
+            (["--plan", "pro"], "plan", "pro"),
+            (["--plan", "max5"], "plan", "max5"),
+            (["--plan", "max20"], "plan", "max20"),
+            (["--plan", "custom_max"], "plan", "custom_max"),
+            (["--reset-hour", "0"], "reset_hour", 0),
+            (["--reset-hour", "12"], "reset_hour", 12),
+            (["--reset-hour", "23"], "reset_hour", 23),
+            (["--refresh", "10"], "refresh", 10),
+            (["--timezone", "UTC"], "timezone", "UTC"),
+            (["--timezone", "US/Eastern"], "timezone", "US/Eastern"),
+            (["--timezone", "Asia/Tokyo"], "timezone", "Asia/Tokyo"),
+            (["--timezone", "Europe/London"], "timezone", "Europe/London"),
+        ],
+    )
+    def test_parse_args_single_option(self, monkeypatch, options, attr, expected):
+        """Test each option is parsed into its attribute."""
+        monkeypatch.setattr(sys, "argv", ["ccusage-monitor", *options])
+        args = parse_args()
+
+        assert getattr(args, attr) == expected
+
+    def test_parse_args_returns_cliargs_protocol(self, monkeypatch):
         """Test that parse_args returns object with CLIArgs protocol."""
-        with patch("sys.argv", ["ccusage-monitor"]):
-            args = parse_args()
+        monkeypatch.setattr(sys, "argv", ["ccusage-monitor"])
+        args = parse_args()
 
         # Check that all required attributes exist
         assert hasattr(args, "plan")
@@ -135,20 +131,11 @@ class TestParseArgs:
         assert hasattr(args, "rich")
         assert hasattr(args, "refresh")
 
-    def test_parse_args_help_text_exists(self):
+    def test_parse_args_help_text_exists(self, monkeypatch):
         """Test that help text is available."""
-        with patch("sys.argv", ["ccusage-monitor", "--help"]):
-            with pytest.raises(SystemExit):
-                parse_args()
-
-    def test_parse_args_timezone_examples(self):
-        """Test various timezone formats."""
-        timezones = ["UTC", "US/Eastern", "Asia/Tokyo", "Europe/London"]
-
-        for tz in timezones:
-            with patch("sys.argv", ["ccusage-monitor", "--timezone", tz]):
-                args = parse_args()
-                assert args.timezone == tz
+        monkeypatch.setattr(sys, "argv", ["ccusage-monitor", "--help"])
+        with pytest.raises(SystemExit):
+            parse_args()
 
 
 if __name__ == "__main__":
@@ -1,86 +1,120 @@
 """Comprehensive tests for ccusage_monitor.core.data module."""
 
 import asyncio
+import json
+import os
+import shutil
 import subprocess
+import threading
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+import ccusage_monitor.core.data as core_data
+from ccusage_monitor.core import disk_cache
+from ccusage_monitor.core.cache import cache
 from ccusage_monitor.core.data import (
+    _LIMITS,
+    _parse,
     check_ccusage_installed,
     get_token_limit,
     run_ccusage,
     run_ccusage_async,
 )
+from tests.helpers import cache_scope, capture_print, printed_text, reset_all_caches
+
+# Canned ccusage payloads, kept as pre-encoded literals instead of json.dumps() calls
+_STDOUT_SIMPLE = b'{"blocks": [{"totalTokens": 100}]}'
+_STDOUT_ASYNC = b'{"blocks": [{"totalTokens": 150}]}'
+# The same payloads as parsed: read-only, with arrays as tuples
+_DATA_SIMPLE = {"blocks": ({"totalTokens": 100},)}
+_DATA_ASYNC = {"blocks": ({"totalTokens": 150},)}
+_ARGV = ["ccusage", "blocks", "--offline", "--json"]
+
+
+@pytest.fixture(autouse=True)
+def _cache_scope():
+    """Drop shared-cache entries written by each test."""
+    with cache_scope():
+        yield
+
+
+def _data_set_calls(mock_set):
+    """Return the values stored under ccusage data keys."""
+    return [args[1] for args, _kwargs in mock_set.call_args_list if args[0].startswith("ccusage_data:")]
 
 
 class TestCheckCcusageInstalled:
     """Test the check_ccusage_installed function."""
 
-    @patch("shutil.which")
-    @patch("ccusage_monitor.core.cache.cache.get")
-    @patch("ccusage_monitor.core.cache.cache.set")
-    def test_ccusage_found_first_time(self, mock_set, mock_get, mock_which):
+    @pytest.fixture(autouse=True)
+    def _fresh_probe(self):
+        """Forget the memoized probe result around each test."""
+        reset_all_caches()
+        yield
+        reset_all_caches()
+
+    @patch.object(shutil, "which")
+    def test_ccusage_found_first_time(self, mock_which):
         """Test when ccusage is found for the first time."""
-        mock_get.return_value = None  # Not cached
         mock_which.return_value = "/usr/local/bin/ccusage"
 
         result = check_ccusage_installed()
 
         assert result is True
         mock_which.assert_called_once_with("ccusage")
-        mock_set.assert_called_once_with("ccusage_installed", True)
 
-    @patch("shutil.which")
-    @patch("ccusage_monitor.core.cache.cache.get")
-    def test_ccusage_found_cached(self, mock_get, mock_which):
-        """Test when ccusage status is cached."""
-        mock_get.return_value = True  # Cached as found
+    @patch.object(shutil, "which")
+    def test_ccusage_found_cached(self, mock_which):
+        """Test the install check probes PATH only once per process."""
+        mock_which.return_value = "/usr/local/bin/ccusage"
 
-        result = check_ccusage_installed()
+        assert check_ccusage_installed() is True
+        assert check_ccusage_installed() is True
 
-        assert result is True
-        mock_which.assert_not_called()  # Should not check again
+        mock_which.assert_called_once_with("ccusage")
 
-    @patch("shutil.which")
-    @patch("ccusage_monitor.core.cache.cache.get")
-    @patch("ccusage_monitor.core.cache.cache.set")
-    @patch("builtins.print")
-    def test_ccusage_not_found(self, mock_print, mock_set, mock_get, mock_which):
+    @patch.object(shutil, "which")
+    def test_ccusage_not_found(self, mock_which):
         """Test when ccusage is not found."""
-        mock_get.return_value = None  # Not cached
         mock_which.return_value = None  # Not found
 
-        result = check_ccusage_installed()
+        with capture_print() as calls:
+            result = check_ccusage_installed()
 
         assert result is False
-        mock_set.assert_called_once_with("ccusage_installed", False)
         # Should print installation instructions
-        assert mock_print.call_count > 0
+        assert "npm install -g ccusage" in printed_text(calls)
 
-    @patch("ccusage_monitor.core.cache.cache.get")
-    def test_ccusage_cached_not_found(self, mock_get):
-        """Test when ccusage is cached as not found."""
-        mock_get.return_value = False  # Cached as not found
+    @patch.object(shutil, "which")
+    def test_ccusage_cached_not_found(self, mock_which):
+        """Test a negative result is not re-probed and instructions print once."""
+        mock_which.return_value = None
 
-        result = check_ccusage_installed()
+        with capture_print() as calls:
+            check_ccusage_installed()
+            result = check_ccusage_installed()
 
         assert result is False
+        mock_which.assert_called_once()
+        assert printed_text(calls).count("npm install -g ccusage") == 1
 
 
 class TestRunCcusage:
     """Test the run_ccusage function."""
 
-    @patch("ccusage_monitor.core.cache.cache.get")
-    @patch("ccusage_monitor.core.cache.cache.set")
-    @patch("subprocess.run")
-    def test_successful_ccusage_run(self, mock_run, mock_set, mock_get):
+    @patch.object(core_data, "_ccusage_path", return_value="/usr/local/bin/ccusage")
+    @patch.object(cache, "get")
+    @patch.object(cache, "set")
+    @patch.object(subprocess, "run")
+    def test_successful_ccusage_run(self, mock_run, mock_set, mock_get, mock_path):
         """Test successful ccusage execution."""
         mock_get.return_value = None  # Not cached
 
         # Mock successful subprocess result
         mock_result = MagicMock()
-        mock_result.stdout = '{"blocks": [{"totalTokens": 100}]}'
+        mock_result.stdout = _STDOUT_SIMPLE
         mock_run.return_value = mock_result
 
         result = run_ccusage()
@@ -90,11 +124,15 @@ class TestRunCcusage:
         assert result["blocks"][0]["totalTokens"] == 100
 
         mock_run.assert_called_once_with(
-            ["ccusage", "blocks", "--offline", "--json"], capture_output=True, text=True, check=True, timeout=10
+            ["/usr/local/bin/ccusage", "blocks", "--offline", "--json"],
+            capture_output=True,
+            check=True,
+            close_fds=False,
+            timeout=10,
         )
-        mock_set.assert_called_once()
+        assert _data_set_calls(mock_set) == [result]
 
-    @patch("ccusage_monitor.core.cache.cache.get")
+    @patch.object(cache, "get")
     def test_cached_ccusage_data(self, mock_get):
         """Test returning cached ccusage data."""
         cached_data = {"blocks": [{"totalTokens": 200}]}
@@ -104,72 +142,252 @@ class TestRunCcusage:
 
         assert result == cached_data
 
-    @patch("ccusage_monitor.core.cache.cache.get")
-    @patch("subprocess.run")
-    @patch("builtins.print")
-    def test_ccusage_timeout(self, mock_print, mock_run, mock_get):
-        """Test ccusage command timeout."""
+    @pytest.mark.skipif(not getattr(subprocess, "_USE_POSIX_SPAWN", False), reason="posix_spawn unavailable")
+    @patch.object(core_data, "_ccusage_path", return_value="/usr/local/bin/ccusage")
+    @patch.object(cache, "get", return_value=None)
+    def test_ccusage_launched_via_posix_spawn(self, mock_get, mock_path):
+        """Test the ccusage invocation qualifies for subprocess's posix_spawn fast path."""
+
+        class SpawnedError(Exception):
+            pass
+
+        with patch.object(subprocess.Popen, "_posix_spawn", side_effect=SpawnedError) as mock_spawn:
+            with pytest.raises(SpawnedError):
+                run_ccusage()
+
+        assert mock_spawn.call_args[0][1] == "/usr/local/bin/ccusage"
+
+    @patch.object(cache, "get", return_value=None)
+    @patch.object(subprocess, "run")
+    def test_identical_output_parsed_once(self, mock_run, mock_get):
+        """Test repeated identical ccusage output reuses the parsed result."""
+        reset_all_caches()
+        mock_run.return_value = MagicMock(stdout=_STDOUT_SIMPLE)
+
+        first = run_ccusage()
+        second = run_ccusage()
+
+        assert mock_run.call_count == 2
+        assert first == second == _DATA_SIMPLE
+        info = _parse.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+    def test_parsed_output_is_read_only(self):
+        """Test the parse shared by cached callers cannot be mutated by one of them."""
+        reset_all_caches()
+        data = _parse(b'{"blocks": [{"totalTokens": 100, "models": ["opus"]}]}')
+
+        with pytest.raises(TypeError):
+            data["blocks"] = []
+        with pytest.raises(TypeError):
+            data["blocks"][0]["totalTokens"] = 0
+        assert data["blocks"][0]["models"] == ("opus",)
+
+    @pytest.mark.parametrize(
+        "side_effect,stdout,expected_needles",
+        [
+            (subprocess.TimeoutExpired(_ARGV, 10), None, ["ccusage command timed out"]),
+            (FileNotFoundError(), None, ["ccusage command not found", "npm install -g ccusage"]),
+            (
+                subprocess.CalledProcessError(1, _ARGV, stderr=b"Auth error"),
+                None,
+                ["Error running ccusage", "Auth error", "ccusage login"],
+            ),
+            (None, b"invalid json", ["Error parsing JSON from ccusage"]),
+        ],
+        ids=["timeout", "not_found", "process_error", "json_decode_error"],
+    )
+    @patch.object(cache, "get")
+    @patch.object(subprocess, "run")
+    def test_ccusage_error_paths(self, mock_run, mock_get, side_effect, stdout, expected_needles):
+        """Test that every ccusage failure returns None and explains the problem."""
         mock_get.return_value = None
-        mock_run.side_effect = subprocess.TimeoutExpired(["ccusage"], 10)
+        mock_run.side_effect = side_effect
+        mock_run.return_value = MagicMock(stdout=stdout)
 
-        result = run_ccusage()
+        with capture_print() as calls:
+            result = run_ccusage()
 
         assert result is None
-        mock_print.assert_called_with("❌ ccusage command timed out")
+        printed = printed_text(calls)
+        for needle in expected_needles:
+            assert needle in printed
+
+
+class TestDiskCache:
+    """Test the on-disk copy of the last ccusage output."""
+
+    @patch.object(subprocess, "run")
+    def test_successful_run_is_saved(self, mock_run, _disk_cache):
+        """Test ccusage stdout is written to the disk cache under its data key."""
+        mock_run.return_value = MagicMock(stdout=_STDOUT_SIMPLE)
+
+        run_ccusage()
+
+        assert _disk_cache.read_bytes() == f"{core_data._ccusage_data_key()}\n".encode() + _STDOUT_SIMPLE
+
+    @patch.object(core_data, "_data_key", None)
+    @patch.object(subprocess, "run")
+    def test_cold_start_reads_fresh_file(self, mock_run, _disk_cache):
+        """Test a new process serves a fresh disk copy without spawning ccusage."""
+        disk_cache.save(core_data._ccusage_data_key(), _STDOUT_SIMPLE)
+
+        assert run_ccusage() == _DATA_SIMPLE
+        mock_run.assert_not_called()
+
+    @patch.object(core_data, "_data_key", None)
+    @patch.object(subprocess, "run")
+    def test_cold_start_ignores_stale_file(self, mock_run, _disk_cache):
+        """Test a disk copy older than the TTL is refetched."""
+        disk_cache.save(core_data._ccusage_data_key(), b'{"blocks": []}')
+        stale = time.time() - disk_cache._DISK_CACHE_TTL - 1
+        os.utime(_disk_cache, (stale, stale))
+        mock_run.return_value = MagicMock(stdout=_STDOUT_SIMPLE)
 
-    @patch("ccusage_monitor.core.cache.cache.get")
-    @patch("subprocess.run")
-    @patch("builtins.print")
-    def test_ccusage_not_found_error(self, mock_print, mock_run, mock_get):
-        """Test ccusage command not found."""
-        mock_get.return_value = None
-        mock_run.side_effect = FileNotFoundError()
+        assert run_ccusage() == _DATA_SIMPLE
+        mock_run.assert_called_once()
+
+    @patch.object(core_data, "_data_key", None)
+    @patch.object(subprocess, "run")
+    def test_cold_start_ignores_other_data_key(self, mock_run, _disk_cache):
+        """Test output saved under another ccusage binary's key is refetched, not served as fresh."""
+        disk_cache.save("ccusage_data:-1.0", b'{"blocks": []}')
+        mock_run.return_value = MagicMock(stdout=_STDOUT_SIMPLE)
+
+        assert run_ccusage() == _DATA_SIMPLE
+        mock_run.assert_called_once()
+
+    @patch.object(os, "replace", side_effect=OSError("read-only"))
+    @patch.object(subprocess, "run")
+    def test_write_failure_is_ignored(self, mock_run, mock_replace):
+        """Test an unwritable cache directory does not break a ccusage run."""
+        mock_run.return_value = MagicMock(stdout=_STDOUT_SIMPLE)
+
+        assert run_ccusage() == _DATA_SIMPLE
+        mock_replace.assert_called_once()
+
+
+class TestCcusageDataKey:
+    """Test the ccusage data cache key invalidation."""
+
+    @patch.object(os.path, "getmtime")
+    @patch.object(shutil, "which", return_value="/usr/local/bin/ccusage")
+    @patch.object(subprocess, "run")
+    def test_mtime_bump_invalidates_cached_data(self, mock_run, mock_which, mock_getmtime):
+        """Test a new ccusage binary forces a refetch once the key is resolved again, even within the data TTL."""
+        mock_run.return_value = MagicMock(stdout=_STDOUT_SIMPLE)
+        mock_getmtime.return_value = 1.0
 
-        result = run_ccusage()
+        run_ccusage()
+        run_ccusage()
+        assert mock_run.call_count == 1  # Second call served from cache
 
-        assert result is None
-        mock_print.assert_called_with("❌ ccusage command not found. Please install it with: npm install -g ccusage")
+        mock_getmtime.return_value = 2.0
+        cache.delete("ccusage_data_key")  # As if the key's five minutes had passed
+        run_ccusage()
+        assert mock_run.call_count == 2
 
-    @patch("ccusage_monitor.core.cache.cache.get")
-    @patch("subprocess.run")
-    @patch("builtins.print")
-    def test_ccusage_process_error(self, mock_print, mock_run, mock_get):
-        """Test ccusage process error."""
-        mock_get.return_value = None
-        error = subprocess.CalledProcessError(1, ["ccusage"])
-        error.stderr = "Auth error"
-        mock_run.side_effect = error
+        # The entry for the old binary is purged
+        stale = [key for key in cache._cache if key == "ccusage_data:1.0"]
+        assert stale == []
 
-        result = run_ccusage()
+    @patch.object(os, "getcwd")
+    @patch.object(shutil, "which", return_value=None)
+    @patch.object(subprocess, "run")
+    def test_cwd_change_keeps_cached_data(self, mock_run, mock_which, mock_getcwd):
+        """Test changing the working directory does not refetch, as ccusage output ignores it."""
+        mock_run.return_value = MagicMock(stdout=_STDOUT_SIMPLE)
+        mock_getcwd.return_value = "/project/a"
 
-        assert result is None
-        # Should print error and solutions
-        assert mock_print.call_count >= 2
-
-    @patch("ccusage_monitor.core.cache.cache.get")
-    @patch("subprocess.run")
-    @patch("builtins.print")
-    def test_ccusage_json_decode_error(self, mock_print, mock_run, mock_get):
-        """Test JSON decode error from ccusage output."""
-        mock_get.return_value = None
+        run_ccusage()
+        mock_getcwd.return_value = "/project/b"
+        cache.delete("ccusage_data_key")
+        run_ccusage()
 
-        mock_result = MagicMock()
-        mock_result.stdout = "invalid json"
-        mock_run.return_value = mock_result
+        assert mock_run.call_count == 1
 
-        result = run_ccusage()
+    @patch.object(os.path, "getmtime", return_value=1.0)
+    @patch.object(shutil, "which", return_value="/usr/local/bin/ccusage")
+    @patch.object(subprocess, "run")
+    def test_cache_hits_reuse_the_key(self, mock_run, mock_which, mock_getmtime):
+        """Test cache hits do not stat the binary again."""
+        mock_run.return_value = MagicMock(stdout=_STDOUT_SIMPLE)
 
-        assert result is None
-        mock_print.assert_called()
+        for _ in range(3):
+            run_ccusage()
+
+        assert mock_run.call_count == 1
+        assert (mock_which.call_count, mock_getmtime.call_count) == (1, 1)
+
+    @patch.object(subprocess, "run")
+    def test_ttl_still_applies(self, mock_run):
+        """Test the data TTL is honoured when the key is unchanged."""
+        mock_run.return_value = MagicMock(stdout=_STDOUT_SIMPLE)
+
+        with patch.object(time, "time") as mock_time:
+            mock_time.return_value = 1000.0
+            run_ccusage()
+            mock_time.return_value = 1000.0 + 6
+            run_ccusage()
+
+        assert mock_run.call_count == 2
+
+
+class TestStampedeLock:
+    """Test concurrent cache misses coalesce into one ccusage subprocess."""
+
+    @patch.object(subprocess, "run")
+    def test_concurrent_sync_misses_spawn_once(self, mock_run):
+        """Test ten threads on a cold cache run ccusage a single time."""
+
+        def slow_run(*args, **kwargs):
+            time.sleep(0.05)
+            return MagicMock(stdout=_STDOUT_SIMPLE)
+
+        mock_run.side_effect = slow_run
+        barrier = threading.Barrier(10)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(run_ccusage())
+
+        threads = [threading.Thread(target=worker) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert mock_run.call_count == 1
+        assert len(results) == 10
+        assert all(result == _DATA_SIMPLE for result in results)
+
+    @patch.object(asyncio, "create_subprocess_exec")
+    def test_concurrent_async_misses_spawn_once(self, mock_create_subprocess):
+        """Test ten gathered coroutines on a cold cache run ccusage a single time."""
+
+        async def communicate():
+            await asyncio.sleep(0.05)
+            return _STDOUT_ASYNC, b""
+
+        mock_create_subprocess.return_value = MagicMock(returncode=0, communicate=communicate)
+
+        async def run_test():
+            return await asyncio.gather(*(run_ccusage_async() for _ in range(10)))
+
+        results = asyncio.run(run_test())
+
+        assert mock_create_subprocess.call_count == 1
+        assert all(result == _DATA_ASYNC for result in results)
 
 
 class TestRunCcusageAsync:
     """Test the run_ccusage_async function."""
 
-    @patch("ccusage_monitor.core.cache.cache.get")
-    @patch("ccusage_monitor.core.cache.cache.set")
-    @patch("asyncio.create_subprocess_exec")
-    @patch("asyncio.wait_for")
+    @patch.object(cache, "get")
+    @patch.object(cache, "set")
+    @patch.object(asyncio, "create_subprocess_exec")
+    @patch.object(asyncio, "wait_for")
     def test_successful_async_ccusage_run(self, mock_wait_for, mock_create_subprocess, mock_set, mock_get):
         """Test successful async ccusage execution."""
         mock_get.return_value = None  # Not cached
@@ -180,7 +398,7 @@ class TestRunCcusageAsync:
         mock_create_subprocess.return_value = mock_proc
 
         # Mock communication result
-        stdout = b'{"blocks": [{"totalTokens": 150}]}'
+        stdout = _STDOUT_ASYNC
         stderr = b""
         mock_wait_for.return_value = (stdout, stderr)
 
@@ -193,9 +411,9 @@ class TestRunCcusageAsync:
         assert result is not None
         assert "blocks" in result
         assert result["blocks"][0]["totalTokens"] == 150
-        mock_set.assert_called_once()
+        assert _data_set_calls(mock_set) == [result]
 
-    @patch("ccusage_monitor.core.cache.cache.get")
+    @patch.object(cache, "get")
     def test_cached_async_ccusage_data(self, mock_get):
         """Test returning cached data in async version."""
         cached_data = {"blocks": [{"totalTokens": 300}]}
@@ -208,11 +426,10 @@ class TestRunCcusageAsync:
         result = asyncio.run(run_test())
         assert result == cached_data
 
-    @patch("ccusage_monitor.core.cache.cache.get")
-    @patch("asyncio.create_subprocess_exec")
-    @patch("asyncio.wait_for")
-    @patch("builtins.print")
-    def test_async_ccusage_timeout(self, mock_print, mock_wait_for, mock_create_subprocess, mock_get):
+    @patch.object(cache, "get")
+    @patch.object(asyncio, "create_subprocess_exec")
+    @patch.object(asyncio, "wait_for")
+    def test_async_ccusage_timeout(self, mock_wait_for, mock_create_subprocess, mock_get):
         """Test async ccusage timeout."""
         mock_get.return_value = None
         mock_create_subprocess.return_value = AsyncMock()
@@ -222,15 +439,15 @@ class TestRunCcusageAsync:
             result = await run_ccusage_async()
             return result
 
-        result = asyncio.run(run_test())
+        with capture_print() as calls:
+            result = asyncio.run(run_test())
 
         assert result is None
-        mock_print.assert_called_with("❌ ccusage command timed out")
+        assert calls[-1] == (("❌ ccusage command timed out",), {})
 
-    @patch("ccusage_monitor.core.cache.cache.get")
-    @patch("asyncio.create_subprocess_exec")
-    @patch("builtins.print")
-    def test_async_ccusage_general_error(self, mock_print, mock_create_subprocess, mock_get):
+    @patch.object(cache, "get")
+    @patch.object(asyncio, "create_subprocess_exec")
+    def test_async_ccusage_general_error(self, mock_create_subprocess, mock_get):
         """Test async ccusage general error."""
         mock_get.return_value = None
         mock_create_subprocess.side_effect = Exception("Something went wrong")
@@ -239,42 +456,77 @@ class TestRunCcusageAsync:
             result = await run_ccusage_async()
             return result
 
-        result = asyncio.run(run_test())
+        with capture_print() as calls:
+            result = asyncio.run(run_test())
 
         assert result is None
-        mock_print.assert_called()
+        assert "Something went wrong" in printed_text(calls)
+
+
+class TestIdenticalPayload:
+    """Test identical ccusage output is not parsed again on a cache miss."""
+
+    @pytest.fixture(autouse=True)
+    def _clear_parse_cache(self):
+        reset_all_caches()
+
+    @patch.object(core_data, "_json_loads", wraps=json.loads)
+    @patch.object(subprocess, "run")
+    def test_sync_refetch_skips_json_loads(self, mock_run, mock_loads):
+        """Test an expired entry refetched with identical stdout is not re-parsed."""
+        mock_run.return_value = MagicMock(stdout=_STDOUT_SIMPLE)
+
+        first = run_ccusage()
+        cache.clear()  # Force a second cache miss
+        second = run_ccusage()
+
+        assert mock_run.call_count == 2
+        mock_loads.assert_called_once_with(_STDOUT_SIMPLE)
+        assert second == first
+
+    @patch.object(core_data, "_json_loads", wraps=json.loads)
+    @patch.object(asyncio, "create_subprocess_exec")
+    def test_async_refetch_skips_json_loads(self, mock_create_subprocess, mock_loads):
+        """Test the async path reuses the parse of identical stdout bytes."""
+
+        async def communicate():
+            return _STDOUT_ASYNC, b""
+
+        mock_create_subprocess.return_value = MagicMock(returncode=0, communicate=communicate)
+
+        async def run_test():
+            first = await run_ccusage_async()
+            cache.clear()
+            return first, await run_ccusage_async()
+
+        first, second = asyncio.run(run_test())
+
+        assert mock_create_subprocess.call_count == 2
+        mock_loads.assert_called_once_with(_STDOUT_ASYNC)
+        assert second == first
 
 
 class TestGetTokenLimit:
     """Test the get_token_limit function."""
 
-    @patch("ccusage_monitor.core.cache.cache.get")
-    @patch("ccusage_monitor.core.cache.cache.set")
-    def test_get_token_limit_known_plans(self, mock_set, mock_get):
+    def test_get_token_limit_known_plans(self):
         """Test token limits for known plans."""
-        mock_get.return_value = None  # Not cached
-
         assert get_token_limit("pro") == 7000
         assert get_token_limit("max5") == 35000
         assert get_token_limit("max20") == 140000
 
-        # Should cache the results
-        assert mock_set.call_count == 3
+    def test_get_token_limit_uses_frozen_table(self):
+        """Test fixed-plan limits come from a read-only mapping, not the cache."""
+        with patch.object(core_data, "cache") as mock_cache:
+            for plan, limit in _LIMITS.items():
+                assert get_token_limit(plan) == limit
 
-    @patch("ccusage_monitor.core.cache.cache.get")
-    def test_get_token_limit_cached(self, mock_get):
-        """Test cached token limits."""
-        mock_get.return_value = 7000
+        assert mock_cache.mock_calls == []
+        with pytest.raises(TypeError):
+            _LIMITS["pro"] = 1  # type: ignore[index]
 
-        result = get_token_limit("pro")
-        assert result == 7000
-
-    @patch("ccusage_monitor.core.cache.cache.get")
-    @patch("ccusage_monitor.core.cache.cache.set")
-    def test_get_token_limit_unknown_plan(self, mock_set, mock_get):
+    def test_get_token_limit_unknown_plan(self):
         """Test unknown plan defaults to pro limit."""
-        mock_get.return_value = None
-
         result = get_token_limit("unknown_plan")
         assert result == 7000
 
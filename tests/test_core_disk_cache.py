@@ -0,0 +1,78 @@
+"""Tests for ccusage_monitor.core.disk_cache module."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from ccusage_monitor.core import disk_cache
+
+_KEY = "ccusage_data:1.0"
+_STDOUT = b'{"blocks": [{"totalTokens": 100}]}'
+
+
+class TestDiskCachePath:
+    """Test where the disk cache lives."""
+
+    def test_honors_xdg_cache_home(self, monkeypatch, tmp_path):
+        """Test the cache file is placed under $XDG_CACHE_HOME when it is set."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+        assert disk_cache._cache_path() == str(tmp_path / "ccusage-monitor" / "last.json")
+
+    def test_defaults_to_home_cache(self, monkeypatch):
+        """Test the cache file falls back to ~/.cache without $XDG_CACHE_HOME."""
+        monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+
+        expected = os.path.join(os.path.expanduser("~"), ".cache", "ccusage-monitor", "last.json")
+        assert disk_cache._cache_path() == expected
+
+
+class TestLoadSave:
+    """Test round trips through the disk cache file."""
+
+    def test_round_trip_under_same_key(self, _disk_cache):
+        """Test saved output is loaded back under the key it was saved with."""
+        disk_cache.save(_KEY, _STDOUT)
+
+        assert disk_cache.load(_KEY) == _STDOUT
+
+    def test_other_key_misses(self, _disk_cache):
+        """Test output saved under one data key is not returned for another."""
+        disk_cache.save(_KEY, _STDOUT)
+
+        assert disk_cache.load("ccusage_data:2.0") is None
+
+    def test_missing_file_misses(self, _disk_cache):
+        """Test a missing cache file is a miss, not an error."""
+        assert disk_cache.load(_KEY) is None
+
+    def test_unchanged_payload_only_touches_file(self, _disk_cache):
+        """Test saving identical output again refreshes the mtime instead of rewriting the file."""
+        disk_cache.save(_KEY, _STDOUT)
+        stale = os.stat(_disk_cache).st_mtime - 60
+        os.utime(_disk_cache, (stale, stale))
+
+        with patch.object(os, "replace") as mock_replace:
+            disk_cache.save(_KEY, _STDOUT)
+
+        mock_replace.assert_not_called()
+        assert os.stat(_disk_cache).st_mtime > stale
+        assert disk_cache.load(_KEY) == _STDOUT
+
+    @pytest.mark.parametrize("key,stdout", [(_KEY, b'{"blocks": []}'), ("ccusage_data:2.0", _STDOUT)])
+    def test_changed_payload_is_rewritten(self, _disk_cache, key, stdout):
+        """Test new output or a new data key replaces the file."""
+        disk_cache.save(_KEY, _STDOUT)
+        disk_cache.save(key, stdout)
+
+        assert disk_cache.load(key) == stdout
+
+    def test_deleted_file_is_rewritten(self, _disk_cache):
+        """Test an unchanged payload is written again when the file has gone."""
+        disk_cache.save(_KEY, _STDOUT)
+        _disk_cache.unlink()
+
+        disk_cache.save(_KEY, _STDOUT)
+
+        assert disk_cache.load(_KEY) == _STDOUT
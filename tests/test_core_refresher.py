@@ -0,0 +1,83 @@
+"""Tests for ccusage_monitor.core.refresher module."""
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+import ccusage_monitor.core.data as core_data
+from ccusage_monitor.core import refresher
+from ccusage_monitor.core.refresher import start_refresher, stop_refresher
+
+
+class TestRefresher:
+    """Test the background ccusage refresher."""
+
+    @patch.object(refresher, "_MIN_REFRESH_INTERVAL", 0.01)
+    @patch.object(core_data, "_data_stored_at", 0.0)
+    @patch.object(core_data, "_fetch_ccusage_async", new_callable=AsyncMock)
+    def test_refresher_lifecycle(self, mock_fetch):
+        """Test the refresher fetches repeatedly and stops on request."""
+        fetched = threading.Event()
+
+        async def fetch():
+            if mock_fetch.await_count >= 2:
+                fetched.set()
+
+        mock_fetch.side_effect = fetch
+
+        thread = start_refresher(interval=0.01)
+        try:
+            assert thread.daemon
+            assert fetched.wait(timeout=2)
+        finally:
+            stop_refresher()
+
+        assert not thread.is_alive()
+
+    @patch.object(core_data, "_fetch_ccusage_async", new_callable=AsyncMock)
+    def test_refresher_started_once(self, mock_fetch):
+        """Test starting an already running refresher reuses the thread."""
+        first = start_refresher(interval=10)
+        try:
+            assert start_refresher(interval=10) is first
+        finally:
+            stop_refresher()
+
+    @patch.object(core_data, "_data_stored_at", time.time() + 3600)
+    @patch.object(core_data, "_fetch_ccusage_async", new_callable=AsyncMock)
+    def test_refresher_skips_data_stored_while_waiting(self, mock_fetch):
+        """Test the refresher takes the run_ccusage lock and skips a fetch another caller already stored."""
+        lock = threading.Lock()
+        released = threading.Event()
+
+        def release():
+            lock.release()
+            released.set()
+
+        with patch.object(core_data, "_ccusage_lock", SimpleNamespace(acquire=lock.acquire, release=release)):
+            start_refresher(interval=10)
+            try:
+                assert released.wait(timeout=2)
+            finally:
+                stop_refresher()
+
+        mock_fetch.assert_not_awaited()
+
+    @pytest.mark.parametrize(
+        "interval,stored_ago,delay",
+        [(3, 0.0, 4.0), (10, 0.0, 10.0), (0, 2.5, 1.5), (0, 60.0, 1.0), (-5, 60.0, 1.0)],
+        ids=["before_expiry", "slow_interval", "partly_aged", "stale_floor", "negative_interval"],
+    )
+    def test_refresh_delay_follows_data_ttl(self, interval, stored_ago, delay):
+        """Test refreshes wait until just before the data expires, at least interval and never under the floor."""
+        with patch.object(time, "time", return_value=1000.0), patch.object(
+            core_data, "_data_stored_at", 1000.0 - stored_ago
+        ):
+            assert refresher._refresh_delay(interval) == pytest.approx(delay)
+
+    def test_stop_without_start(self):
+        """Test stopping a refresher that never started is a no-op."""
+        stop_refresher()
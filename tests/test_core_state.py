@@ -0,0 +1,53 @@
+"""Tests for ccusage_monitor.core.state module."""
+
+from typing import Any, cast
+
+import pytest
+
+from ccusage_monitor.core.state import MonitorState, data_fingerprint
+from ccusage_monitor.protocols import CcusageBlock, CcusageData
+
+
+class TestMonitorState:
+    """Test change detection over ccusage data."""
+
+    def _data(self, **fields: Any) -> CcusageData:
+        """Build ccusage data with one active block, overriding any of its fields."""
+        block = {"totalTokens": 1000, "startTime": "2024-01-01T10:00:00Z", "isActive": True, **fields}
+        return CcusageData(blocks=[cast(CcusageBlock, block)])
+
+    def test_state_change_detection(self):
+        """Test the first check reports a change, identical data does not, new totals do."""
+        state = MonitorState()
+
+        assert state.data_changed(self._data()) is True
+        assert state.data_changed(self._data()) is False
+        assert state.data_changed(self._data(totalTokens=1500)) is True
+        assert state.data_changed(self._data(totalTokens=1500)) is False
+
+    def test_fingerprint_is_a_short_digest(self):
+        """Test the fingerprint is 16 bytes and ignores fields the monitor does not render."""
+        data = self._data()
+        noisy = self._data(models=["claude"])
+
+        assert len(data_fingerprint(data)) == 16
+        assert data_fingerprint(data) == data_fingerprint(noisy)
+
+    @pytest.mark.parametrize(
+        "field,value",
+        [
+            ("startTime", "2024-01-01T11:00:00Z"),
+            ("actualEndTime", "2024-01-01T12:00:00Z"),
+            ("isActive", False),
+            ("isGap", True),
+        ],
+    )
+    def test_fingerprint_tracks_rendered_fields(self, field, value):
+        """Test each field that feeds the display changes the fingerprint."""
+        assert data_fingerprint(self._data(**{field: value})) != data_fingerprint(self._data())
+
+    def test_fingerprint_treats_null_flags_as_false(self):
+        """Test null isActive/isGap values hash like False instead of raising."""
+        nulls = self._data(isActive=None, isGap=None)
+
+        assert data_fingerprint(nulls) == data_fingerprint(self._data(isActive=False))
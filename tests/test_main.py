@@ -0,0 +1,76 @@
+"""Tests for the ccusage_monitor.main entry point."""
+
+import importlib
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+from ccusage_monitor.core import data
+from ccusage_monitor.main import _build_parser, main, parse_args
+from ccusage_monitor.ui import display
+from tests.helpers import printed_text
+
+
+class TestParseArgs:
+    """Test command line parsing in the legacy entry point."""
+
+    def test_parser_is_built_once(self):
+        """Test the argument parser is memoized."""
+        assert _build_parser() is _build_parser()
+
+    def test_repeated_calls_parse_current_argv(self, monkeypatch):
+        """Test the shared parser still parses whatever sys.argv holds."""
+        monkeypatch.setattr(sys, "argv", ["ccusage-monitor", "--plan", "max5", "--refresh", "7"])
+        first = parse_args()
+        monkeypatch.setattr(sys, "argv", ["ccusage-monitor", "--timezone", "UTC", "--rich"])
+        second = parse_args()
+
+        assert (first.plan, first.refresh, first.timezone, first.rich) == ("max5", 7, "Europe/Warsaw", False)
+        assert (second.plan, second.refresh, second.timezone, second.rich) == ("pro", 3, "UTC", True)
+        assert first is not second
+
+
+@pytest.mark.integration
+class TestMainLoop:
+    """Test the legacy entry point's monitoring loop."""
+
+    @patch.object(time, "sleep")
+    @patch.object(data, "run_ccusage", return_value={"blocks": [{"totalTokens": 1000, "isActive": False}]})
+    @patch.object(data, "get_token_limit", return_value=7000)
+    @patch.object(data, "check_ccusage_installed", return_value=True)
+    def test_stops_after_max_iterations(self, mock_check, mock_limit, mock_run, mock_sleep, display_mocks, monkeypatch):
+        """Test main returns after max_iterations refreshes and restores the cursor."""
+        monkeypatch.setattr(sys, "argv", ["ccusage-monitor"])
+        main(max_iterations=2)
+
+        assert mock_run.call_count == 2
+        display_mocks.show_cursor.assert_called_once()
+
+    @pytest.mark.skipif(
+        not getattr(importlib.import_module("ccusage_monitor.main"), "OPTIMIZED", False),
+        reason="OPTIMIZED build not active",
+    )
+    @patch.object(display, "writeln")
+    @patch.object(time, "sleep")
+    @patch.object(data, "run_ccusage")
+    @patch.object(data, "get_token_limit", return_value=7000)
+    @patch.object(data, "check_ccusage_installed", return_value=True)
+    def test_performance_indicator(
+        self,
+        mock_check,
+        mock_limit,
+        mock_run,
+        mock_sleep,
+        mock_writeln,
+        display_mocks,
+        sample_active_blocks,
+        monkeypatch,
+    ):
+        """Test --performance adds the optimized indicator to the status line."""
+        mock_run.return_value = sample_active_blocks
+        monkeypatch.setattr(sys, "argv", ["ccusage-monitor", "--performance"])
+        main(max_iterations=1)
+
+        assert "⚡ OPTIMIZED" in printed_text(mock_writeln.call_args_list)
@@ -0,0 +1,39 @@
+"""Tests for the ccusage_monitor package layout."""
+
+import importlib
+
+import pytest
+
+MODULES = [
+    "ccusage_monitor",
+    "ccusage_monitor.__main__",
+    "ccusage_monitor.main",
+    "ccusage_monitor.protocols",
+    "ccusage_monitor.core.cache",
+    "ccusage_monitor.core.calculations",
+    "ccusage_monitor.core.config",
+    "ccusage_monitor.core.data",
+    "ccusage_monitor.core.disk_cache",
+    "ccusage_monitor.core.refresher",
+    "ccusage_monitor.core.state",
+    "ccusage_monitor.ui.display",
+    "ccusage_monitor.ui.frame",
+    "ccusage_monitor.ui.rich_display",
+    "ccusage_monitor.ui.rich_display_new",
+    "ccusage_monitor.app.main",
+    "ccusage_monitor.app.main_rich",
+]
+
+
+class TestModuleStructure:
+    """Test every module of the package imports cleanly."""
+
+    @pytest.mark.parametrize("module", MODULES)
+    def test_importable(self, module):
+        """Test the module imports without errors."""
+        assert importlib.import_module(module).__name__ == module
+
+    @pytest.mark.parametrize("module", ["ccusage_monitor.main", "ccusage_monitor.app.main", "ccusage_monitor.__main__"])
+    def test_entry_points_expose_main(self, module):
+        """Test each entry-point module exposes a callable main."""
+        assert callable(importlib.import_module(module).main)
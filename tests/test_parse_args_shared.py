@@ -0,0 +1,34 @@
+"""Tests shared by both parse_args entry points."""
+
+import sys
+
+import pytest
+
+from ccusage_monitor.core import config
+from ccusage_monitor.main import parse_args as main_parse_args
+
+PARSE_ARGS = pytest.mark.parametrize("parse_args", [main_parse_args, config.parse_args], ids=["main", "core.config"])
+
+
+class TestSharedParseArgs:
+    """Test behavior both the legacy and the core.config parser must agree on."""
+
+    @PARSE_ARGS
+    def test_default_values(self, monkeypatch, parse_args):
+        """Test parsing with no options yields the defaults."""
+        monkeypatch.setattr(sys, "argv", ["ccusage-monitor"])
+        args = parse_args()
+
+        assert args.plan == "pro"
+        assert args.timezone == "Europe/Warsaw"
+        assert args.refresh == 3
+        assert args.performance is False
+        assert args.rich is False
+        assert args.reset_hour is None
+
+    @PARSE_ARGS
+    def test_invalid_plan_raises_error(self, monkeypatch, parse_args):
+        """Test an invalid plan exits through argparse."""
+        monkeypatch.setattr(sys, "argv", ["ccusage-monitor", "--plan", "invalid"])
+        with pytest.raises(SystemExit):
+            parse_args()
@@ -0,0 +1,97 @@
+"""Opt-in benchmarks for ccusage_monitor hot paths.
+
+These use pytest-benchmark and only run when RUN_PERF is set, so the regular
+suite carries no wall-clock assertions::
+
+    RUN_PERF=1 pytest tests/test_performance.py
+"""
+
+import os
+import subprocess
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ccusage_monitor.core.data import get_token_limit, run_ccusage
+from ccusage_monitor.ui.display import _time_bar, _token_bar, create_time_progress_bar, create_token_progress_bar
+from tests.helpers import cache_scope, reset_all_caches
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(not os.environ.get("RUN_PERF"), reason="perf: set RUN_PERF=1 to run benchmarks"),
+]
+
+_STDOUT_100_BLOCKS = ('{"blocks": [' + ", ".join(['{"totalTokens": 1000}'] * 100) + "]}").encode()
+
+# (percentage, elapsed_minutes, total_minutes) for the progress-bar benchmarks
+_BAR_ARGS = [(i, i * 3, i * 2) for i in range(100)]
+
+
+def _best_per_call_ns(func, iterations=10_000, runs=5):
+    """Time func over several batches and return the fastest mean per-call latency in ns.
+
+    perf_counter_ns is monotonic, and taking the best batch filters out GC
+    and scheduler noise.
+    """
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            func()
+        elapsed = (time.perf_counter_ns() - start) / iterations
+        best = min(best, elapsed)
+    return best
+
+
+def test_cached_progress_bar_latency():
+    """Test a cached progress-bar lookup stays under 100 µs (100 ms per 1000 calls)."""
+    create_token_progress_bar(42.0)
+
+    assert _best_per_call_ns(lambda: create_token_progress_bar(42.0)) < 100_000
+
+
+def test_token_limit_perf(benchmark):
+    """Benchmark fixed-plan token limit lookups."""
+    benchmark(lambda: [get_token_limit(plan) for plan in ("pro", "max5", "max20")])
+
+
+@patch.object(subprocess, "run")
+def test_run_ccusage_cached_perf(mock_run, benchmark):
+    """Benchmark run_ccusage when served from the cache."""
+    mock_run.return_value = MagicMock(stdout=_STDOUT_100_BLOCKS)
+    with cache_scope():
+        run_ccusage()
+
+        result = benchmark(run_ccusage)
+
+    assert result is not None
+    assert len(result["blocks"]) == 100
+    assert mock_run.call_count == 1
+
+
+class TestCachedProgressBars:
+    """Benchmark memoized progress-bar lookups."""
+
+    @pytest.fixture(scope="class")
+    def progress_bar_100_x_50(self):
+        """Build the 100 benchmarked bars once for the whole class."""
+        reset_all_caches()
+        for pct, elapsed, total in _BAR_ARGS:
+            create_token_progress_bar(pct)
+            create_time_progress_bar(elapsed, total)
+        yield
+        reset_all_caches()
+
+    def test_cached_progress_bars_perf(self, benchmark, progress_bar_100_x_50):
+        """Benchmark 100 cached token and time bar lookups."""
+        misses = _token_bar.cache_info().misses, _time_bar.cache_info().misses
+
+        def lookups():
+            for pct, elapsed, total in _BAR_ARGS:
+                create_token_progress_bar(pct)
+                create_time_progress_bar(elapsed, total)
+
+        benchmark(lookups)
+
+        assert (_token_bar.cache_info().misses, _time_bar.cache_info().misses) == misses
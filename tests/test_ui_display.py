@@ -1,64 +1,105 @@
 """Comprehensive tests for ccusage_monitor.ui.display module."""
 
-from io import StringIO
+import os
+import shutil
+import sys
 from unittest.mock import patch
 
 import pytest
 
+from ccusage_monitor.ui import display
 from ccusage_monitor.ui.display import (
     OutputBuffer,
     _buffer,
+    _build_header,
+    _format_time_int,
+    _time_bar,
+    _token_bar,
+    begin_frame,
+    clear_below_cursor,
     clear_screen,
     create_time_progress_bar,
     create_token_progress_bar,
     flush_buffer,
+    flush_frame,
     format_time,
     hide_cursor,
+    move_cursor_to_top,
     print_header,
     show_cursor,
     writeln,
 )
+from tests.helpers import reset_all_caches
+
+# Expected bar fragments, built once at import
+GREEN = "\033[92m"
+RED = "\033[91m"
+BLUE = "\033[94m"
+RESET = "\033[0m"
+TEN_BLOCKS = "█" * 10
+FIFTEEN_BLOCKS = "█" * 15
+TWENTY_FIVE_BLOCKS = "█" * 25
+TWENTY_FIVE_EMPTY = "░" * 25
+FORTY_EMPTY = "░" * 40
+WIDE_BLOCKS = "█" * 150
+WIDE_EMPTY = "░" * 150
+
+
+@pytest.fixture(autouse=True)
+def _reset_buffer():
+    """Start every test with an empty global output buffer."""
+    _buffer.__init__()
+    yield
+    _buffer.__init__()
+
+
+@pytest.fixture
+def buffer():
+    """Provide a fresh OutputBuffer with no queued terminal output."""
+    display._pending.clear()
+    yield OutputBuffer()
+    display._pending.clear()
 
 
 class TestOutputBuffer:
     """Test the OutputBuffer class."""
 
-    def test_buffer_initialization(self):
+    def test_buffer_initialization(self, buffer):
         """Test buffer initializes correctly."""
-        buffer = OutputBuffer()
-        assert buffer.buffer.getvalue() == ""
+        assert buffer.getvalue() == ""
         assert buffer.last_output == ""
 
-    def test_buffer_write(self):
+    def test_buffer_write(self, buffer):
         """Test writing to buffer."""
-        buffer = OutputBuffer()
         buffer.write("test text")
-        assert buffer.buffer.getvalue() == "test text"
+        assert buffer.getvalue() == "test text"
 
-    def test_buffer_writeln(self):
+    def test_buffer_writeln(self, buffer):
         """Test writing line to buffer."""
-        buffer = OutputBuffer()
         buffer.writeln("test line")
-        assert buffer.buffer.getvalue() == "test line\n"
+        assert buffer.getvalue() == "test line\n"
 
-    @patch("sys.stdout.write")
-    @patch("builtins.print")
-    def test_buffer_flush_new_content(self, mock_print, mock_write):
+    def test_buffer_collects_parts(self, buffer):
+        """Test writes are kept as parts and joined on demand."""
+        buffer.write("a")
+        buffer.writeln("b")
+        buffer.writeln()
+
+        assert buffer.parts == ["a", "b", "\n", "", "\n"]
+        assert buffer.getvalue() == "ab\n\n"
+
+    def test_buffer_flush_new_content(self, buffer, capsys):
         """Test flushing buffer with new content."""
-        buffer = OutputBuffer()
         buffer.write("new content")
 
         buffer.flush()
 
-        mock_write.assert_called_once_with("new content")
+        assert capsys.readouterr().out == "\033[Hnew content\033[J"
         assert buffer.last_output == "new content"
-        assert buffer.buffer.getvalue() == ""  # Buffer should be reset
+        assert buffer.getvalue() == ""  # Buffer should be reset
 
-    @patch("sys.stdout.write")
-    @patch("builtins.print")
-    def test_buffer_flush_same_content(self, mock_print, mock_write):
+    def test_buffer_flush_same_content(self, buffer, capsys):
         """Test flushing buffer with same content doesn't update."""
-        buffer = OutputBuffer()
         buffer.write("same content")
         buffer.flush()
 
@@ -67,7 +108,101 @@ class TestOutputBuffer:
         buffer.flush()
 
         # Should only write once
-        mock_write.assert_called_once()
+        assert capsys.readouterr().out == "\033[Hsame content\033[J"
+
+    def test_buffer_flush_writes_only_changed_tail(self, buffer, capsys):
+        """Test only a changed last line is rewritten in a frame of the same height."""
+        buffer.write("header\nbody\nstatus 1\n")
+        buffer.flush()
+        capsys.readouterr()
+
+        buffer.write("header\nbody\nstatus 2\n")
+        buffer.flush()
+
+        assert capsys.readouterr().out == "\033[3;1H\033[2Kstatus 2\n\033[J"
+
+    def test_buffer_flush_rewrites_changed_lines_in_place(self, buffer, capsys):
+        """Test unchanged lines between changed ones are skipped, and the last line is always rewritten."""
+        buffer.write("time 1\nheader\nusage 10\nfooter\n")
+        buffer.flush()
+        capsys.readouterr()
+
+        buffer.write("time 2\nheader\nusage 9\nfooter\n")
+        buffer.flush()
+
+        assert capsys.readouterr().out == (
+            "\033[1;1H\033[2Ktime 2\n\033[3;1H\033[2Kusage 9\n\033[4;1H\033[2Kfooter\n\033[J"
+        )
+
+    def test_buffer_flush_taller_frame_rewrites_from_first_change(self, buffer, capsys):
+        """Test a frame that gains lines is redrawn from the first changed line."""
+        buffer.write("header\nstatus\n")
+        buffer.flush()
+        capsys.readouterr()
+
+        buffer.write("header\nwarning\nstatus\n")
+        buffer.flush()
+
+        assert capsys.readouterr().out == "\033[2;1Hwarning\nstatus\n\033[J"
+
+    def test_buffer_flush_wrapped_line_redraws_whole_frame(self, buffer, capsys):
+        """Test a line that could wrap at the terminal width forces a full redraw instead of a row diff."""
+        buffer.write("header\nstatus\n")
+        buffer.flush()
+        capsys.readouterr()
+
+        buffer.write(f"header\n{GREEN}{'█' * 20}{RESET}\nstatus\n")
+        with patch.object(shutil, "get_terminal_size", return_value=os.terminal_size((20, 24))):
+            buffer.flush()
+
+        assert capsys.readouterr().out == f"\033[Hheader\n{GREEN}{'█' * 20}{RESET}\nstatus\n\033[J"
+
+    def test_buffer_flush_same_height_wrapped_line_redraws_whole_frame(self, buffer, capsys):
+        """Test a same-height frame wider than the terminal is redrawn whole, not patched row by row."""
+        buffer.write(f"header\n{'░' * 30}\nstatus 1\n")
+        buffer.flush()
+        capsys.readouterr()
+
+        buffer.write(f"header\n{'█' * 30}\nstatus 2\n")
+        with patch.object(shutil, "get_terminal_size", return_value=os.terminal_size((20, 24))):
+            buffer.flush()
+
+        assert capsys.readouterr().out == f"\033[Hheader\n{'█' * 30}\nstatus 2\n\033[J"
+
+    def test_buffer_flush_shorter_frame_clears_below(self, buffer, capsys):
+        """Test a frame that drops trailing lines clears them."""
+        buffer.write("header\nwarning\n")
+        buffer.flush()
+        capsys.readouterr()
+
+        buffer.write("header\n")
+        buffer.flush()
+
+        assert capsys.readouterr().out == "\033[2;1H\033[J"
+
+    def test_buffer_invalidate_redraws_whole_frame(self, buffer, capsys):
+        """Test an invalidated buffer redraws an unchanged frame instead of diffing against it."""
+        buffer.write("header\nstatus 1\n")
+        buffer.flush()
+        capsys.readouterr()
+
+        buffer.invalidate()
+        buffer.write("header\nstatus 1\n")
+        buffer.flush()
+
+        assert capsys.readouterr().out == "\033[Hheader\nstatus 1\n\033[J"
+
+    @pytest.mark.parametrize("wipe", [begin_frame, clear_screen], ids=["begin_frame", "clear_screen"])
+    def test_screen_clears_invalidate_last_frame(self, wipe, capsys):
+        """Test clearing the screen makes the next frame a full redraw, not a diff against the wiped one."""
+        writeln("header")
+        flush_buffer()
+
+        wipe()
+        writeln("header")
+        flush_buffer()
+
+        assert capsys.readouterr().out.endswith("\033[Hheader\n\033[J")
 
 
 class TestProgressBars:
@@ -100,17 +235,71 @@ class TestProgressBars:
         assert isinstance(bar, str)
         assert "50.0%" in bar
 
-    @patch("ccusage_monitor.core.cache.cache.get")
-    @patch("ccusage_monitor.core.cache.cache.set")
-    def test_create_token_progress_bar_caching(self, mock_set, mock_get):
-        """Test that progress bars are cached."""
-        mock_get.return_value = None  # Not cached
+    def test_create_token_progress_bar_caching(self):
+        """Test that progress bars are memoized per tenth of a percent."""
+        reset_all_caches()
 
         bar1 = create_token_progress_bar(25.0)
-        bar2 = create_token_progress_bar(25.0)  # Same value
+        bar2 = create_token_progress_bar(25.04)  # Same tenth
 
         assert bar1 == bar2
-        mock_set.assert_called()  # Should cache the result
+        info = _token_bar.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+    def test_create_token_progress_bar_cache_growth(self):
+        """Test memoized bars grow with distinct tenths of a percent, not with calls."""
+        reset_all_caches()
+        unique = dict.fromkeys(round(i / 100.0, 1) for i in range(1000))
+
+        for pct in unique:
+            create_token_progress_bar(pct, 50)
+
+        assert _token_bar.cache_info().currsize == len(unique)
+
+    def test_create_token_progress_bar_fill_runs(self):
+        """Test the bar body is made of the expected filled and empty runs."""
+        bar = create_token_progress_bar(20.0, width=50)
+        assert f"[{GREEN}{TEN_BLOCKS}{RED}{FORTY_EMPTY}{RESET}]" in bar
+
+    def test_create_token_progress_bar_wide_and_overflowing(self):
+        """Test widths beyond the precomputed table and percentages over 100%."""
+        wide = create_token_progress_bar(50.0, width=300)
+        assert f"{WIDE_BLOCKS}{RED}{WIDE_EMPTY}" in wide
+
+        over = create_token_progress_bar(150.0, width=10)
+        assert f"{FIFTEEN_BLOCKS}{RESET}" in over
+
+    @pytest.mark.parametrize(
+        "percentage,body,absent",
+        [
+            (0.0, f"[{RED}{'░' * 50}{RESET}]", GREEN),
+            (100.0, f"[{GREEN}{'█' * 50}{RESET}]", RED),
+        ],
+        ids=["empty", "full"],
+    )
+    def test_create_token_progress_bar_skips_empty_run_colors(self, percentage, body, absent):
+        """Test a bar with one empty run carries no color code for it."""
+        bar = create_token_progress_bar(percentage, width=50)
+
+        assert body in bar
+        assert absent not in bar
+
+    def test_cached_output_equals_uncached(self):
+        """Test memoized bars and times match a fresh computation once every cache is cleared."""
+        calls = [
+            (create_token_progress_bar, (42.0,)),
+            (create_token_progress_bar, (99.95, 30)),
+            (create_time_progress_bar, (37.4, 300)),
+            (format_time, (125,)),
+        ]
+        for func, args in calls:
+            func(*args)
+        cached = [func(*args) for func, args in calls]
+
+        reset_all_caches()
+
+        assert [func(*args) for func, args in calls] == cached
+        assert _token_bar.cache_info().hits == 0
 
     def test_create_time_progress_bar_zero_elapsed(self):
         """Test time progress bar with zero elapsed time."""
@@ -146,89 +335,212 @@ class TestProgressBars:
         assert isinstance(bar, str)
         assert "⏰" in bar
 
+    def test_create_time_progress_bar_fill_runs(self):
+        """Test the time bar body is made of blue elapsed and red remaining runs."""
+        bar = create_time_progress_bar(150, 300)
+        assert f"[{BLUE}{TWENTY_FIVE_BLOCKS}{RED}{TWENTY_FIVE_EMPTY}{RESET}]" in bar
 
-class TestFormatTime:
-    """Test the format_time function."""
+    def test_create_time_progress_bar_caching(self):
+        """Test that time bars are memoized per whole minute."""
+        reset_all_caches()
 
-    def test_format_time_minutes_only(self):
-        """Test formatting time with minutes only."""
-        assert format_time(30) == "30m"
-        assert format_time(59) == "59m"
+        bar1 = create_time_progress_bar(150, 300)
+        bar2 = create_time_progress_bar(149.8, 300.0)
 
-    def test_format_time_hours_only(self):
-        """Test formatting time with exact hours."""
-        assert format_time(60) == "1h"
-        assert format_time(120) == "2h"
-        assert format_time(180) == "3h"
+        assert bar1 == bar2
+        info = _time_bar.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
 
-    def test_format_time_hours_and_minutes(self):
-        """Test formatting time with hours and minutes."""
-        assert format_time(65) == "1h 5m"
-        assert format_time(125) == "2h 5m"
-        assert format_time(185) == "3h 5m"
 
-    def test_format_time_zero(self):
-        """Test formatting zero time."""
-        assert format_time(0) == "0m"
+class TestFormatTime:
+    """Test the format_time function."""
+
+    @pytest.mark.parametrize(
+        "minutes,expected",
+        [
+            (0, "0m"),
+            (30, "30m"),
+            (59, "59m"),
+            (60, "1h"),
+            (120, "2h"),
+            (180, "3h"),
+            (65, "1h 5m"),
+            (90, "1h 30m"),
+            (125, "2h 5m"),
+            (185, "3h 5m"),
+        ],
+    )
+    def test_format_time_values(self, minutes, expected):
+        """Test minutes, exact hours and mixed durations, and that repeats hit the memo."""
+        assert format_time(minutes) == expected
+        assert format_time(minutes) is format_time(minutes)
 
     def test_format_time_fractional(self):
         """Test formatting fractional minutes."""
         assert format_time(30.7) == "31m"  # Should round
         assert format_time(59.2) == "59m"
 
-    @patch("ccusage_monitor.core.cache.cache.get")
-    @patch("ccusage_monitor.core.cache.cache.set")
-    def test_format_time_caching(self, mock_set, mock_get):
-        """Test that formatted times are cached."""
-        mock_get.return_value = None  # Not cached
+    def test_format_time_caching(self):
+        """Test that formatted times are memoized per rounded minute."""
+        reset_all_caches()
+
+        assert format_time(125) == "2h 5m"
+        assert format_time(124.8) == "2h 5m"
 
-        result = format_time(125)
-        assert result == "2h 5m"
-        mock_set.assert_called()
+        info = _format_time_int.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+    def test_format_time_negative(self):
+        """Test negative durations stay in minutes."""
+        assert format_time(-5) == "-5m"
 
 
 class TestDisplayFunctions:
     """Test display utility functions."""
 
-    @patch("ccusage_monitor.core.cache.cache.get")
-    @patch("ccusage_monitor.ui.display.write_to_buffer")
-    def test_print_header_caching(self, mock_write, mock_get):
-        """Test header printing with caching."""
-        mock_get.return_value = None  # Not cached
+    @patch.object(display, "write_to_buffer")
+    def test_rebuilt_header_equals_prebuilt(self, mock_write):
+        """Test a freshly built header matches the one written by print_header."""
+        print_header()
+        print_header()
+
+        cached_first, cached_second = (call.args[0] for call in mock_write.call_args_list)
+        assert cached_first == cached_second == _build_header()
 
+    @patch.object(display, "_build_header")
+    @patch.object(display, "write_to_buffer")
+    def test_print_header_caching(self, mock_write, mock_build):
+        """Test print_header writes the import-time header without rebuilding it."""
+        print_header()
         print_header()
 
-        mock_write.assert_called_once()
+        mock_build.assert_not_called()
+        assert mock_write.call_count == 2
+        assert "CLAUDE TOKEN MONITOR" in mock_write.call_args.args[0]
 
-    @patch("ccusage_monitor.ui.display._buffer.writeln")
+    @patch.object(display._buffer, "writeln")
     def test_writeln_function(self, mock_writeln):
         """Test writeln function."""
         writeln("test message")
         mock_writeln.assert_called_once_with("test message")
 
-    @patch("ccusage_monitor.ui.display._buffer.flush")
+    @patch.object(display._buffer, "flush")
     def test_flush_buffer_function(self, mock_flush):
         """Test flush_buffer function."""
         flush_buffer()
         mock_flush.assert_called_once()
 
-    @patch("builtins.print")
-    def test_clear_screen(self, mock_print):
-        """Test clear_screen function."""
+
+class TestTerminalControlFunctions:
+    """Test the queued terminal control sequences."""
+
+    @pytest.fixture(autouse=True)
+    def _clear_pending(self):
+        display._pending.clear()
+        yield
+        display._pending.clear()
+
+    @pytest.mark.parametrize(
+        "func,sequence",
+        [
+            (clear_screen, "\033[2J\033[3J\033[H"),
+            (hide_cursor, "\033[?25l"),
+            (show_cursor, "\033[?25h"),
+            (move_cursor_to_top, "\033[H"),
+            (clear_below_cursor, "\033[J"),
+        ],
+    )
+    def test_control_sequence_is_queued(self, func, sequence):
+        """Test each control helper queues its escape sequence instead of writing."""
+        with patch.object(sys.stdout, "write") as mock_write:
+            func()
+
+        assert display._pending == [sequence]
+        mock_write.assert_not_called()
+
+    @pytest.fixture
+    def raw_write(self):
+        """Route flush_frame through a mocked os.write on a fake stdout descriptor."""
+        with patch.object(display, "_stdout_fd", return_value=99), patch.object(
+            os, "write", side_effect=lambda fd, data: len(data)
+        ) as mock_write:
+            yield mock_write
+
+    @pytest.fixture
+    def text_stdout(self):
+        """Route flush_frame through the sys.stdout text layer."""
+        with patch.object(display, "_stdout_fd", return_value=None):
+            yield
+
+    @pytest.mark.usefixtures("text_stdout")
+    @patch.object(sys.stdout, "flush")
+    @patch.object(sys.stdout, "write")
+    def test_flush_frame_single_write(self, mock_write, mock_flush):
+        """Test queued sequences are written with one write and one flush."""
         clear_screen()
-        mock_print.assert_called_once()
+        hide_cursor()
+
+        flush_frame()
 
-    @patch("builtins.print")
-    def test_hide_cursor(self, mock_print):
-        """Test hide_cursor function."""
+        mock_write.assert_called_once_with("\033[2J\033[3J\033[H\033[?25l")
+        mock_flush.assert_called_once()
+        assert display._pending == []
+
+    @patch.object(sys.stdout, "write")
+    def test_flush_frame_single_os_write(self, mock_text_write, raw_write):
+        """Test a frame for a real descriptor goes out as one os.write of encoded bytes."""
+        clear_screen()
         hide_cursor()
-        mock_print.assert_called_once()
 
-    @patch("builtins.print")
-    def test_show_cursor(self, mock_print):
-        """Test show_cursor function."""
-        show_cursor()
-        mock_print.assert_called_once()
+        flush_frame()
+
+        raw_write.assert_called_once()
+        fd, data = raw_write.call_args.args
+        assert (fd, bytes(data)) == (99, b"\033[2J\033[3J\033[H\033[?25l")
+        mock_text_write.assert_not_called()
+        assert display._pending == []
+
+    def test_flush_frame_retries_partial_os_write(self, raw_write):
+        """Test a short os.write is continued until the whole frame is written."""
+        written = []
+
+        def short_write(fd, data):
+            written.append(bytes(data[:4]))
+            return len(written[-1])
+
+        raw_write.side_effect = short_write
+        display._emit("✦ frame")
+
+        flush_frame()
+
+        assert b"".join(written) == "✦ frame".encode()
+        assert raw_write.call_count == 3
+
+    @pytest.mark.parametrize("error", [AttributeError, OSError, ValueError])
+    def test_stdout_without_descriptor_uses_text_layer(self, error):
+        """Test streams without a usable fileno() fall back to sys.stdout.write."""
+        with patch.object(sys, "stdout") as mock_stdout:
+            mock_stdout.fileno.side_effect = error
+
+            assert display._stdout_fd() is None
+
+    @patch.object(sys.stdout, "write")
+    def test_flush_frame_nothing_queued(self, mock_write):
+        """Test flushing an empty queue writes nothing."""
+        flush_frame()
+        mock_write.assert_not_called()
+
+    @pytest.mark.usefixtures("text_stdout")
+    @patch.object(sys.stdout, "flush")
+    @patch.object(sys.stdout, "write")
+    def test_begin_frame_single_write(self, mock_write, mock_flush):
+        """Test begin_frame hides the cursor and clears the screen in one write."""
+        begin_frame()
+
+        mock_write.assert_called_once_with("\033[?25l\033[2J\033[3J\033[H")
+        mock_flush.assert_called_once()
+        assert display._pending == []
 
 
 class TestGlobalBuffer:
@@ -241,12 +553,8 @@ class TestGlobalBuffer:
 
     def test_global_buffer_operations(self):
         """Test operations on global buffer."""
-        # Clear any existing content
-        _buffer.buffer = StringIO()
-        _buffer.last_output = ""
-
         writeln("test global buffer")
-        assert _buffer.buffer.getvalue() == "test global buffer\n"
+        assert _buffer.getvalue() == "test global buffer\n"
 
 
 if __name__ == "__main__":
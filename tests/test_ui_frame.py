@@ -0,0 +1,34 @@
+"""Tests for ccusage_monitor.ui.frame module."""
+
+import pytest
+
+from ccusage_monitor.core.config import GREEN, RESET
+from ccusage_monitor.ui.frame import frame_diff, line_width
+
+
+class TestLineWidth:
+    """Test the line_width function."""
+
+    @pytest.mark.parametrize(
+        "line,width",
+        [("plain\n", 5), (f"{GREEN}██{RESET}\033[2K", 2), ("🟢 [", 4)],
+        ids=["plain", "escapes", "wide"],
+    )
+    def test_line_width_skips_escapes_and_counts_wide_glyphs(self, line, width):
+        """Test line widths ignore escape sequences and the newline and count wide glyphs as two columns."""
+        assert line_width(line) == width
+
+
+class TestFrameDiff:
+    """Test the frame_diff function."""
+
+    def test_first_frame_is_drawn_from_the_top(self):
+        """Test a frame with nothing on screen is written whole from the home position."""
+        assert frame_diff("", "header\nstatus\n", 80) == "\033[Hheader\nstatus\n\033[J"
+
+    def test_wide_old_frame_forces_full_redraw(self):
+        """Test a line of the frame on screen that could have wrapped also forces a full redraw."""
+        old = f"header\n{'█' * 30}\n"
+        new = "header\nstatus\n"
+
+        assert frame_diff(old, new, 20) == f"\033[H{new}\033[J"